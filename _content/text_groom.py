@@ -12,6 +12,7 @@ mod_dir = os.path.join(os.path.dirname(__file__), '..')
 if mod_dir not in sys.path:
     sys.path.append(mod_dir)
 
+from proofing_helpers import charsets as cs
 from proofing_helpers.charsets import *
 from proofing_helpers.files import chain_charset_texts
 from proofing_helpers.helpers import list_uni_names
@@ -85,7 +86,7 @@ def categorize_lines(cs_prefix, cs_index=5):
         else:
             charset_name = f'{cs_prefix.lower()}{i}'
         cs_file = os.path.join(content_dir, charset_name.upper() + '.txt')
-        charset = set(eval(charset_name))
+        charset = set(getattr(cs, charset_name))
         charset.update(set(space_chars))
 
         if cs_prefix == 'AC':
@@ -130,7 +131,7 @@ def check_text_file(cs_prefix, cs_index=5):
         charset_name = f'{cs_prefix.lower()}{cs_index}'
 
     charset_file_name = charset_name.upper() + '.txt'
-    charset = set(eval(charset_name.lower()))  # | set(space_chars)
+    charset = set(getattr(cs, charset_name))  # | set(space_chars)
 
     raw_content = chain_charset_texts(cs_prefix, cs_index)
 
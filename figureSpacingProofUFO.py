@@ -17,26 +17,22 @@ import os
 
 import argparse
 import subprocess
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import drawBot as db
 
 from fontParts.fontshell import RFont
 
-from proofing_helpers.drawing import draw_glyph
-from proofing_helpers.files import get_ufo_paths
+from proofing_helpers.files import get_temp_file_path, get_ufo_paths
 from proofing_helpers.globals import FONT_MONO
+from proofing_helpers.pages import join_pdfs
 from proofing_helpers.stamps import timestamp
 
-
-def joinit(iterable, delimiter):
-    '''
-    https://stackoverflow.com/a/5656097
-    '''
-    it = iter(iterable)
-    yield next(it)
-    for x in it:
-        yield delimiter
-        yield x
+BASIC_FIGURES = (
+    'zero', 'one', 'two', 'three', 'four',
+    'five', 'six', 'seven', 'eight', 'nine')
 
 
 def chunks(lst, n):
@@ -60,52 +56,83 @@ def dot_suffixes(suffix_list):
     return dotted_suffix_list
 
 
-def make_page(args, font, suffix):
-    proof_text = make_proof_text(font.glyphOrder, suffix)
+def make_page(args, font, suffix, font_keys):
+    proof_text = make_proof_text(font_keys, suffix)
     all_gnames = set([gn for line in proof_text for gn in line])
 
-    if set(all_gnames) <= set(font.keys()):
-        db.newPage('A4Landscape')
-        # A4Landscape: 842 x 505
-
-        stamp = db.FormattedString(
-            '{} | {} | {}'.format(
-                os.path.basename(font.path),
-                suffix,
-                timestamp(readable=True)),
-            font=FONT_MONO,
-            fontSize=10,
-            align='right')
-
-        db.textBox(stamp, (280, 20, 542, 20))
-        MARGIN = 30
-        x_offset = MARGIN
-        y_offset = db.height() - MARGIN - args.point_size
-        scale_factor = args.point_size / 1000
-        line_space = args.point_size * 1.2
-
-        for line in proof_text:
-
-            for gname in line:
-                with db.savedState():
-                    glyph = font[gname]
-                    db.translate(x_offset, y_offset)
-                    db.scale(scale_factor)
-                    draw_glyph(glyph)
-                    x_offset += glyph.width * scale_factor
-            x_offset = MARGIN
-            y_offset -= line_space
-    else:
-        not_supported = sorted(set(all_gnames) - set(font.keys()))
+    if not all_gnames <= font_keys:
+        not_supported = all_gnames - font_keys
         print(
             f'{", ".join(sorted(not_supported))}\n'
             f'not in {font.info.styleName}')
+        return False
+
+    db.newPage('A4Landscape')
+    # A4Landscape: 842 x 505
+
+    stamp = db.FormattedString(
+        '{} | {} | {}'.format(
+            os.path.basename(font.path),
+            suffix,
+            timestamp(readable=True)),
+        font=FONT_MONO,
+        fontSize=10,
+        align='right')
+
+    db.textBox(stamp, (280, 20, 542, 20))
+    MARGIN = 30
+    y_offset = db.height() - MARGIN - args.point_size
+    scale_factor = args.point_size / 1000
+    # line space in font units, since the scale is applied once per page
+    line_space = 1000 * 1.2
+    # the spacer glyph is drawn many times, so glyph paths are cached
+    glyph_paths = {}
+
+    with db.savedState():
+        db.translate(MARGIN, y_offset)
+        db.scale(scale_factor)
+        for line in proof_text:
+            # all glyphs of a line are combined into a single path
+            line_path = db.BezierPath()
+            x_advance = 0
+            for gname in line:
+                glyph = font[gname]
+                if gname not in glyph_paths:
+                    glyph_path = db.BezierPath(glyphSet=font)
+                    glyph.draw(glyph_path)
+                    glyph_paths[gname] = glyph_path
+                glyph_path = glyph_paths[gname].copy()
+                glyph_path.translate(x_advance, 0)
+                line_path.appendPath(glyph_path)
+                x_advance += glyph.width
+
+            db.drawPath(line_path)
+            db.translate(0, -line_space)
+    return True
+
+
+def make_font_pdf(args, ufo_path, suffixes):
+    '''
+    Make the pages for a single UFO, and save them to a temporary PDF file.
+    Return the path of that file (or None if no page could be made).
+    '''
+    font = RFont(ufo_path)
+    font_keys = frozenset(font.keys())
+    db.newDrawing()
+    pages_made = [
+        make_page(args, font, suffix, font_keys) for suffix in suffixes]
+    if any(pages_made):
+        pdf_path = get_temp_file_path('.pdf')
+        db.saveImage(pdf_path)
+    else:
+        pdf_path = None
+    db.endDrawing()
+    return pdf_path
 
 
 def make_proof_text(available_gnames, suffix=''):
     spacer = 'zero' + suffix
-    basic_figures = 'zero one two three four five six seven eight nine'.split()
-    figures = [figure + suffix for figure in basic_figures]
+    figures = [figure + suffix for figure in BASIC_FIGURES]
     output = []
 
     # brittle
@@ -115,7 +142,11 @@ def make_proof_text(available_gnames, suffix=''):
         figures.insert(0, 'zero.lfslash')
 
     for line in chunks(figures, 4):
-        joined_line = [spacer] + list(joinit(line, spacer)) + [spacer]
+        # spacer before, between and after the figures
+        joined_line = [spacer]
+        for figure in line:
+            joined_line.append(figure)
+            joined_line.append(spacer)
         output.append(joined_line)
     return output
 
@@ -154,18 +185,19 @@ if __name__ == '__main__':
     ufos = get_ufo_paths(args.path)
     ufos.sort()
     base_path = os.path.basename(os.path.normpath(args.path))
-    output_path = (
-        f'~/Desktop/figure spacing {base_path}.pdf'
-    )
-
-    fonts = [RFont(ufo) for ufo in ufos]
-    if fonts:
-        figure_variants = set([
-            gn for f in fonts for gn in f.keys() if
-            '.' in gn and
-            gn.split('.')[0] == 'three'])
+    output_path = Path(
+        f'~/Desktop/figure spacing {base_path}.pdf').expanduser()
 
+    if ufos:
         if args.suffixes is None:
+            # only the glyph names are needed here, the fonts are loaded
+            # one at a time, and not kept around.
+            figure_variants = set()
+            for ufo in ufos:
+                figure_variants.update(
+                    gn for gn in RFont(ufo).keys() if
+                    gn.startswith('three.'))
+
             suffixes = [''] + sorted(
                 ['.' + gn.split('.')[-1] for gn in figure_variants])
 
@@ -180,14 +212,20 @@ if __name__ == '__main__':
         else:
             suffixes = dot_suffixes(args.suffixes)
 
-        db.newDrawing()
-        for font in fonts:
-            for suffix in suffixes:
-                make_page(args, font, suffix)
-        db.saveImage(output_path)
-        db.endDrawing()
-
-        subprocess.call(['open', os.path.expanduser(output_path)])
+        # every UFO is proofed to a separate PDF in parallel,
+        # those PDFs are joined afterwards.
+        with ProcessPoolExecutor() as executor:
+            pdf_paths = list(executor.map(
+                partial(make_font_pdf, args, suffixes=suffixes), ufos))
+        pdf_paths = [pdf_path for pdf_path in pdf_paths if pdf_path]
+
+        if pdf_paths:
+            join_pdfs(pdf_paths, output_path)
+            for pdf_path in pdf_paths:
+                os.remove(pdf_path)
+            subprocess.Popen(['open', output_path])
+        else:
+            print('no pages made')
 
     else:
         print(f'no UFOs found in {args.path}')
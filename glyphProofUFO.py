@@ -21,6 +21,7 @@ import re
 
 import argparse
 import colorsys
+import functools
 import random
 import subprocess
 
@@ -28,9 +29,10 @@ import defcon
 import drawBot as db
 
 from proofing_helpers import fontSorter
-from proofing_helpers.drawing import draw_glyph
+from proofing_helpers.drawing import draw_glyph, draw_horizontal_lines
 from proofing_helpers.files import get_ufo_paths
 from proofing_helpers.globals import FONT_MONO
+from proofing_helpers.pages import ChunkedDocument
 from proofing_helpers.stamps import timestamp
 
 
@@ -39,6 +41,9 @@ BOX_WIDTH = 200
 BOX_HEIGHT = BOX_WIDTH * 1.5
 margin = BOX_HEIGHT * 0.1
 
+# fully saturated colors for anchor connectors, one per hue step
+ANCHOR_COLORS = [colorsys.hls_to_rgb(i / 256, 0.5, 1) for i in range(256)]
+
 
 def get_options(args=None):
     parser = argparse.ArgumentParser(
@@ -100,6 +105,15 @@ def get_options(args=None):
     return parser.parse_args(args)
 
 
+@functools.lru_cache(maxsize=None)
+def get_stamp_template(font_size):
+    '''
+    Centered stamp style, made once per font size. Copy before use.
+    '''
+    return db.FormattedString(
+        font=FONT_MONO, fontSize=font_size, align='center')
+
+
 def draw_anchors(glyph, size):
     radius = size / 2
     for anchor in glyph.anchors:
@@ -118,48 +132,39 @@ def draw_metrics(glyph):
     # stroke(0.5)
     # strokeWidth(0.5)
     # font = glyph.font
-    font = glyph.getParent()
-    db.line((0, font.info.descender), (glyph.width, font.info.descender))
-    db.line((0, font.info.xHeight), (glyph.width, font.info.xHeight))
-    db.line((0, font.info.capHeight), (glyph.width, font.info.capHeight))
-    db.line((0, font.info.ascender), (glyph.width, font.info.ascender))
-
-
-def calc_vector(p1, p2):
-    x1, y1 = p1
-    x2, y2 = p2
-    return x2 - x1, y2 - y1
-
+    info = glyph.getParent().info
+    draw_horizontal_lines(
+        (info.descender, info.xHeight, info.capHeight, info.ascender),
+        0, glyph.width)
 
-def calc_distance(p1, p2):
-    return math.hypot(*calc_vector(p1, p2))
 
-
-def calc_angle(p1, p2):
-    dx, dy = calc_vector(p1, p2)
-    return math.atan2(dy, dx)
-
-
-def polar_point(center, radius, angle):
+def calc_midpoint(p1, p2):
     '''
-    Get points on a circle for arbitrary angle
+    Get the point halfway between two points
     '''
-    x = center[0] + radius * math.cos(angle)
-    y = center[1] + radius * math.sin(angle)
-    return x, y
+    x1, y1 = p1
+    x2, y2 = p2
+    return (x1 + x2) / 2, (y1 + y2) / 2
 
 
 def get_random_glyph(font_list):
     '''
-    Gets a random glyph (with outlines) to display on cover
+    Gets a random glyph (with outlines) to display on cover.
+    If no glyph has contours, a glyph made of components is returned;
+    if no glyph has anything to draw, None is returned.
     '''
-    random_font = db.choice(font_list)
-    random_glyph = db.choice([glyph for glyph in random_font.keys()])
-    glyph = random_font[random_glyph]
-
-    if not len(glyph):
-        glyph = get_random_glyph(font_list)
-    return glyph
+    fallback_glyph = None
+    # fonts and glyph names are tried in random order, each one only once
+    for random_font in random.sample(font_list, len(font_list)):
+        glyph_names = list(random_font.keys())
+        random.shuffle(glyph_names)
+        for glyph_name in glyph_names:
+            glyph = random_font[glyph_name]
+            if len(glyph):
+                return glyph
+            if fallback_glyph is None and glyph.components:
+                fallback_glyph = glyph
+    return fallback_glyph
 
 
 def make_gradient():
@@ -179,7 +184,9 @@ def make_gradient():
     return start_color, end_color
 
 
-def make_single_glyph_page(args, page_width, page_height, font, glyph_name):
+def make_single_glyph_page(
+    args, page_width, page_height, font, font_keys, glyph_name
+):
     '''
     A page with a single glyph, intended for a “flip-book” style showing.
     '''
@@ -188,7 +195,7 @@ def make_single_glyph_page(args, page_width, page_height, font, glyph_name):
         ufo_name = font.info.postscriptFontName
     stamp = u'%s – %s' % (ufo_name, glyph_name)
     db.newPage(page_width, page_height)
-    if glyph_name in font.keys():
+    if glyph_name in font_keys:
         glyph = font[glyph_name]
         db.fill(0)
     else:
@@ -197,8 +204,8 @@ def make_single_glyph_page(args, page_width, page_height, font, glyph_name):
     x_offset = (db.width() - glyph.width) // 2
     y_offset = 250
 
-    fs = db.FormattedString(
-        txt=stamp, font=FONT_MONO, fontSize=20, align='center')
+    fs = get_stamp_template(20).copy()
+    fs.append(stamp)
     db.textBox(fs, (0, 0, db.width(), 100))
 
     db.translate(x_offset, y_offset)
@@ -209,30 +216,36 @@ def make_single_glyph_page(args, page_width, page_height, font, glyph_name):
             draw_anchors(glyph, 30)
 
 
-def make_overlay_glyph_page(args, page_width, page_height, font_list, glyph_name):
+def make_overlay_glyph_page(
+    args, page_width, page_height, glyph_fonts, glyph_name
+):
     '''
     A page with all glyphs of the same name overlaid (in outlines).
+    glyph_fonts are the fonts which contain the glyph.
     '''
     stamp = u'%s' % glyph_name
     db.newPage(page_width, page_height)
-    for font in font_list:
-        if glyph_name in font.keys():
+    y_offset = 250
+    with db.savedState():
+        db.strokeWidth(0.5)
+        for font in glyph_fonts:
             glyph = font[glyph_name]
-            with db.savedState():
-                db.fill(None)
-                db.stroke(0)
-                db.strokeWidth(0.5)
-                x_offset = (db.width() - glyph.width) // 2
-                y_offset = 250
-                db.translate(x_offset, y_offset)
-                draw_glyph(glyph)
-                db.stroke(None)
-                if args.anchors:
-                    if glyph.anchors:
-                        draw_anchors(glyph, 30)
-
-    fs = db.FormattedString(
-        txt=stamp, font=FONT_MONO, fontSize=20, align='center')
+            if not (len(glyph) or glyph.components or glyph.anchors):
+                # nothing to draw
+                continue
+            db.fill(None)
+            db.stroke(0)
+            x_offset = (db.width() - glyph.width) // 2
+            db.translate(x_offset, y_offset)
+            draw_glyph(glyph)
+            db.stroke(None)
+            if args.anchors:
+                if glyph.anchors:
+                    draw_anchors(glyph, 30)
+            db.translate(-x_offset, -y_offset)
+
+    fs = get_stamp_template(20).copy()
+    fs.append(stamp)
     db.textBox(fs, (0, 0, db.width(), 100))
 
 
@@ -242,7 +255,7 @@ def get_family_name(font_list):
     '''
     template_font = font_list[0]
     family_name = template_font.info.familyName
-    if all(['Italic' in f.info.styleName for f in font_list]):
+    if all('Italic' in f.info.styleName for f in font_list):
         # Add "Italic" to the family name, so Roman- and Italic PDFs don’t
         # overwrite each other
         family_name += ' Italic'
@@ -250,52 +263,36 @@ def get_family_name(font_list):
     return family_name
 
 
-def make_gradient_page(page_width, page_height, glyph_name, font_list):
+def make_gradient_page(page_width, page_height, glyph_name, glyph_fonts):
 
     scale_factor = BOX_WIDTH / 1000
     stamp = u'%s' % (glyph_name)
     db.newPage(page_width, page_height)
-    combined_width = sum(
-        [f[glyph_name].width for f in font_list if glyph_name in f.keys()])
+    glyphs = [font[glyph_name] for font in glyph_fonts]
+    combined_width = sum([glyph.width for glyph in glyphs])
     x_offset = (page_width - combined_width * scale_factor) / 2
     y_offset = 100
 
     with db.savedState():
         db.translate(x_offset, y_offset)
         db.scale(scale_factor)
-        for font in font_list:
-            if glyph_name in font.keys():
-                glyph = font[glyph_name]
-                draw_glyph(glyph)
-                db.translate(glyph.width, 0)
+        for glyph in glyphs:
+            draw_glyph(glyph)
+            db.translate(glyph.width, 0)
 
-    fs = db.FormattedString(
-        txt=stamp, font=FONT_MONO, fontSize=10, align='center')
+    fs = get_stamp_template(10).copy()
+    fs.append(stamp)
     db.textBox(fs, (0, 0, page_width, 50))
 
 
-def make_cover(page_width, page_height, font_list, margin=20):
+def draw_cover_glyph(cover_glyph, page_height):
     '''
-    Make cover with gradient, some info about the family, and a large white
-    shape overlaid.
+    Draw a glyph as a large white shape on the cover.
     '''
-    family_name = get_family_name(font_list)
-
-    db.newPage(page_width, page_height)
-    start_color, end_color = make_gradient()
-
-    db.linearGradient(
-        (0, 0),  # startPoint
-        (0, page_width),  # endPoint
-        [(start_color), (end_color)],  # colors
-    )
-
-    db.rect(0, 0, page_width, page_height)
-    cover_glyph = get_random_glyph(font_list)
-
     with db.savedState():
-        glyph_height = cover_glyph.bounds[3] - cover_glyph.bounds[1]
-        glyph_width = cover_glyph.bounds[2] - cover_glyph.bounds[0]
+        x_min, y_min, x_max, y_max = cover_glyph.bounds
+        glyph_height = y_max - y_min
+        glyph_width = x_max - x_min
 
         if glyph_height > glyph_width:
             scale_factor = page_height / glyph_height
@@ -303,7 +300,7 @@ def make_cover(page_width, page_height, font_list, margin=20):
             scale_factor = page_height / glyph_width
 
         db.scale(scale_factor)
-        db.translate(-cover_glyph.leftMargin, -cover_glyph.bounds[1])
+        db.translate(-cover_glyph.leftMargin, -y_min)
 
         db.translate(-glyph_width / 2, -glyph_height / 2)
         db.scale(2)
@@ -315,6 +312,28 @@ def make_cover(page_width, page_height, font_list, margin=20):
         cg_name = cover_glyph.name
         print(f'cover: {cg_name} ({cg_font})')
 
+
+def make_cover(page_width, page_height, font_list, family_name, margin=20):
+    '''
+    Make cover with gradient, some info about the family, and a large white
+    shape overlaid.
+    '''
+    db.newPage(page_width, page_height)
+    start_color, end_color = make_gradient()
+
+    db.linearGradient(
+        (0, 0),  # startPoint
+        (0, page_width),  # endPoint
+        [(start_color), (end_color)],  # colors
+    )
+
+    db.rect(0, 0, page_width, page_height)
+    cover_glyph = get_random_glyph(font_list)
+    if cover_glyph is not None and cover_glyph.bounds is not None:
+        draw_cover_glyph(cover_glyph, page_height)
+    else:
+        print('cover: no glyph with outlines found')
+
     cover_text = '{}\n{}'.format(
         family_name, timestamp(readable=True, connector='\n'))
 
@@ -331,150 +350,134 @@ def make_cover(page_width, page_height, font_list, margin=20):
     db.textBox(cover_stamp, (rect_size))
 
 
-def make_proof_page(args, box_width, box_height, glyph_name, font_list):
+def make_proof_page(
+    args, glyph_name, font_list, font_keys,
+    uni_dict, bpl, page_width, page_height, line_offsets
+):
     '''
     Default mode, in which glyphs are set side-by-side.
+    The values which are the same for every page are computed by the caller.
     '''
-    bpl = get_max_boxes_per_line(args, font_list)
-    lines = math.ceil(len(font_list) / bpl)
-    page_width = BOX_WIDTH * bpl
-    page_height = BOX_HEIGHT * lines
-
-    uni_dict = make_uni_dict(font_list)
     num_glyphs = 0
     current_line = 1
 
-    # see if the glyph exists in at least one of the UFOs
-    glyph_exists = [glyph_name in font for font in font_list]
+    db.newPage(page_width, page_height)
+    db.stroke(0.5)
+    db.strokeWidth(0.5)
 
-    if any(glyph_exists):
+    draw_horizontal_lines(line_offsets, 0, page_width)
 
-        db.newPage(page_width, page_height)
-        db.stroke(0.5)
-        db.strokeWidth(0.5)
+    unicode_value = uni_dict.get(glyph_name)
+    if unicode_value:
+        stamp_text = u'%s | %s | U+%0.4X' % (
+            glyph_name, chr(unicode_value), unicode_value)
+    else:
+        stamp_text = glyph_name
 
-        for i in range(1, lines + 1):
-            y_offset = page_height - (box_height * i) + BOX_WIDTH * 0.4
-            db.line((0, y_offset), (page_width, y_offset))
+    stamp = get_stamp_template(10).copy()
+    stamp.append(stamp_text)
 
-        unicode_value = uni_dict.get(glyph_name)
-        if unicode_value:
-            stamp_text = u'%s | %s | U+%0.4X' % (
-                glyph_name, chr(unicode_value), unicode_value)
-        else:
-            stamp_text = glyph_name
-
-        stamp = db.FormattedString(
-            txt=stamp_text,
-            font=FONT_MONO,
-            fontSize=10,
-            align='center'
-        )
-
-        rect_size = (
-            margin, page_height - margin,
-            page_width - 2 * margin, margin / 2)
-        db.fill(None)
-        db.textBox(stamp, (rect_size))
-        x_offset = 0
-        anchor_list = []
-        anchor_dict = {}
-        max_anchors_per_line = bpl
-        for font in font_list:
-            num_glyphs += 1
-            db.fill(0)
-            y_offset = page_height - (box_height * current_line) + box_width * 0.4
+    rect_size = (
+        margin, page_height - margin,
+        page_width - 2 * margin, margin / 2)
+    db.fill(None)
+    db.textBox(stamp, (rect_size))
+    x_offset = 0
+    anchor_list = []
+    anchor_dict = {}
+    max_anchors_per_line = bpl
+    for font, keys in zip(font_list, font_keys):
+        num_glyphs += 1
+        db.fill(0)
+        y_offset = line_offsets[current_line - 1]
 
-            # stylename_stamp = db.FormattedString(
-            #     txt=weight_code,
-            #     font=FONT_MONO,
-            #     fontSize=10,
-            #     align='center'
-            # )
+        # stylename_stamp = db.FormattedString(
+        #     txt=weight_code,
+        #     font=FONT_MONO,
+        #     fontSize=10,
+        #     align='center'
+        # )
 
-            if glyph_name in font:
-                db.fill(0)
-                glyph = font[glyph_name]
-                draw_sb = True
-                # draw_vm = True
+        if glyph_name in keys:
+            db.fill(0)
+            glyph = font[glyph_name]
+            draw_sb = True
+            # draw_vm = True
 
+        else:
+            db.fill(0.8)
+            if '.notdef' in keys:
+                glyph = font['.notdef']
+            elif 'space' in keys:
+                glyph = font['space']
             else:
-                db.fill(0.8)
-                if '.notdef' in font.keys():
-                    glyph = font['.notdef']
-                elif 'space' in font.keys():
-                    glyph = font['space']
+                gname = font.glyphOrder[0]
+                glyph = font[gname]
+            draw_sb = False
+            # draw_vm = False
+            max_anchors_per_line -= 1
+
+        with db.savedState():
+
+            scale_factor = BOX_WIDTH / 1000
+            local_offset = (BOX_WIDTH - glyph.width * scale_factor) // 2
+            db.translate(x_offset + local_offset, y_offset)
+            db.scale(scale_factor)
+
+            if draw_sb:
+                draw_sidebearings(glyph)
+            # metrics don’t look good
+            # if draw_vm:
+            #     draw_metrics(glyph)
+
+            db.stroke(None)
+            draw_glyph(glyph)
+
+            if args.anchors:
+                if glyph.anchors:
+                    for anchor in glyph.anchors:
+                        an_x = anchor.x * scale_factor + x_offset + local_offset
+                        an_y = anchor.y * scale_factor + y_offset
+                        anchor_dict.setdefault(
+                            anchor.name, []).append((an_x, an_y))
+                    draw_anchors(glyph, 30)
+
+        # if current_line == 1:
+        #     textBox(stylename_stamp, (footer_rect))
+
+        x_offset += BOX_WIDTH
+        if num_glyphs % bpl == 0:
+            current_line += 1
+            x_offset = 0
+
+    # current_line = 1
+    # num_glyphs = 0
+    # x_offset = 0
+
+    if args.anchors:
+        for anchor_name, anchor_list in anchor_dict.items():
+            db.strokeWidth(0.5)
+            stroke_color = random.choice(ANCHOR_COLORS)
+            db.stroke(*stroke_color)
+            db.fill(None)
+            for c_index, coord_pair in enumerate(anchor_list):
+
+                if c_index == 0:
+                    db.newPath()
+                    db.moveTo(coord_pair)
+                    previous_pair = coord_pair
+                elif c_index % max_anchors_per_line == 0:
+                    db.newPath()
+                    db.moveTo(anchor_list[c_index])
+                    previous_pair = anchor_list[c_index]
                 else:
-                    gname = font.glyphOrder[0]
-                    glyph = font[gname]
-                draw_sb = False
-                # draw_vm = False
-                max_anchors_per_line -= 1
-
-            with db.savedState():
-
-                scale_factor = BOX_WIDTH / 1000
-                local_offset = (BOX_WIDTH - glyph.width * scale_factor) // 2
-                db.translate(x_offset + local_offset, y_offset)
-                db.scale(scale_factor)
-
-                if draw_sb:
-                    draw_sidebearings(glyph)
-                # metrics don’t look good
-                # if draw_vm:
-                #     draw_metrics(glyph)
-
-                db.stroke(None)
-                draw_glyph(glyph)
-
-                if args.anchors:
-                    if glyph.anchors:
-                        for anchor in glyph.anchors:
-                            an_x = anchor.x * scale_factor + x_offset + local_offset
-                            an_y = anchor.y * scale_factor + y_offset
-                            anchor_dict.setdefault(
-                                anchor.name, []).append((an_x, an_y))
-                        draw_anchors(glyph, 30)
-
-            # if current_line == 1:
-            #     textBox(stylename_stamp, (footer_rect))
-
-            x_offset += BOX_WIDTH
-            if num_glyphs % bpl == 0:
-                current_line += 1
-                x_offset = 0
-
-        # current_line = 1
-        # num_glyphs = 0
-        # x_offset = 0
-
-        if args.anchors:
-            for anchor_name, anchor_list in anchor_dict.items():
-                db.strokeWidth(0.5)
-                hue = random.choice(range(256)) / 256
-                stroke_color = colorsys.hls_to_rgb(hue, 0.5, 1)
-                db.stroke(*stroke_color)
-                db.fill(None)
-                for c_index, coord_pair in enumerate(anchor_list):
-
-                    if c_index == 0:
-                        db.newPath()
-                        db.moveTo(coord_pair)
-                        previous_pair = coord_pair
-                    elif c_index % max_anchors_per_line == 0:
-                        db.newPath()
-                        db.moveTo(anchor_list[c_index])
-                        previous_pair = anchor_list[c_index]
-                    else:
-                        pt_distance = calc_distance(previous_pair, coord_pair)
-                        pt_angle = calc_angle(previous_pair, coord_pair)
-                        pt_center = polar_point(
-                            previous_pair, pt_distance / 2, pt_angle)
-                        pt_center_offset = polar_point(
-                            pt_center, 50, - math.pi / 2)
-                        db.qCurveTo(pt_center_offset, coord_pair)
-                        previous_pair = coord_pair
-                    db.drawPath()
+                    # the control point is 50 units below the midpoint
+                    pt_center_x, pt_center_y = calc_midpoint(
+                        previous_pair, coord_pair)
+                    pt_center_offset = (pt_center_x, pt_center_y - 50)
+                    db.qCurveTo(pt_center_offset, coord_pair)
+                    previous_pair = coord_pair
+                db.drawPath()
 
 
 def get_max_boxes_per_line(args, font_list):
@@ -538,16 +541,48 @@ def ordered_keys(font):
     - ordered by font.glyphOrder
     - existing in the font object
     '''
-    return [gn for gn in font.glyphOrder if gn in font.keys()]
+    font_keys = font.keys()
+    return [gn for gn in font.glyphOrder if gn in font_keys]
+
+
+def get_all_glyphs(font_list, contours_only=False):
+    '''
+    glyph names of all fonts, in glyph order of the first font they appear in.
+    contours_only needs to load every glyph, so it is only done on request.
+    '''
+    all_glyphs = []
+    seen = set()
+    for font in font_list:
+        for gname in ordered_keys(font):
+            if gname in seen:
+                continue
+            if contours_only and not len(font[gname]):
+                continue
+            all_glyphs.append(gname)
+            seen.add(gname)
+    return all_glyphs
+
+
+def get_fonts_by_glyph(glyph_list, font_list, font_keys):
+    '''
+    for each glyph name, the list of fonts which contain that glyph
+    '''
+    return {
+        gname: [
+            font for font, keys in zip(font_list, font_keys) if gname in keys]
+        for gname in glyph_list}
 
 
 def make_uni_dict(font_list):
     '''
     all glyphs of all fonts with their code points
+    (unicodeData is read without loading the glyphs)
     '''
     uni_dict = {}
     for font in font_list:
-        uni_dict.update({g.name: g.unicode for g in font if g.unicode})
+        # glyphs with multiple code points get the lowest one
+        for uni, gnames in sorted(font.unicodeData.items(), reverse=True):
+            uni_dict.update({gname: uni for gname in gnames})
     return uni_dict
 
 
@@ -560,33 +595,22 @@ def main(test_args=None):
         # no sorting, just passing single fonts
         ufo_list = args.d
 
-    font_list = list(map(defcon.Font, [f_path for f_path in ufo_list]))
+    # defcon loads glyphs lazily, so opening the UFOs themselves is cheap
+    font_list = [defcon.Font(f_path) for f_path in ufo_list]
     if font_list:
         for font in font_list:
             print(font.info.styleName)
         family_name = get_family_name(font_list)
-        template_font = font_list[0]
-        all_glyphs = ordered_keys(template_font)
-        contour_glyphs = [
-            gname for gname in all_glyphs if
-            len(template_font[gname])]
-
-        for font in font_list[1:]:
-            addl_glyph_names = [
-                gName for gName in ordered_keys(font) if
-                gName not in all_glyphs]
-            addl_contour_glyphs = [
-                gname for gname in ordered_keys(font) if
-                len(font[gname]) and gname not in contour_glyphs
-            ]
-            all_glyphs.extend(addl_glyph_names)
-            contour_glyphs.extend(addl_contour_glyphs)
+        # glyph names of each font, for membership tests
+        font_keys = [frozenset(font.keys()) for font in font_list]
+        # only glyph names are needed here, no glyph is loaded yet
+        all_glyphs = get_all_glyphs(font_list)
 
         # which glyphs end up in the PDF?
         matches = None
         if args.regex:
             reg_ex = re.compile(args.regex)
-            matches = list(filter(reg_ex.match, all_glyphs))
+            matches = [gname for gname in all_glyphs if reg_ex.match(gname)]
             if matches:
                 print('filtered glyph list:')
                 print(' '.join(matches))
@@ -596,56 +620,84 @@ def main(test_args=None):
                 glyph_list = all_glyphs
         elif args.contours:
             print('contours only')
-            glyph_list = contour_glyphs
+            glyph_list = get_all_glyphs(font_list, contours_only=True)
         else:
             glyph_list = all_glyphs
 
         db.newDrawing()
+        # pages are written to disk in chunks, to keep memory use in check
+        document = ChunkedDocument()
 
         if args.mode == 'single':
             page_height = page_width = 1200
             output_mode = 'page proof'
             if len(glyph_list) > 1:
-                make_cover(page_width, page_height, font_list, margin)
+                make_cover(
+                    page_width, page_height, font_list, family_name, margin)
+                document.add_page()
             for glyph_name in glyph_list:
-                for font in font_list:
+                for font, keys in zip(font_list, font_keys):
                     make_single_glyph_page(
-                        args, page_width, page_height, font, glyph_name)
+                        args, page_width, page_height, font, keys, glyph_name)
+                    document.add_page()
 
         elif args.mode == 'overlay':
             page_height = page_width = 1200
             output_mode = 'overlay proof'
             if len(glyph_list) > 1:
-                make_cover(page_width, page_height, font_list, margin)
+                make_cover(
+                    page_width, page_height, font_list, family_name, margin)
+                document.add_page()
+            fonts_by_glyph = get_fonts_by_glyph(
+                glyph_list, font_list, font_keys)
             for glyph_name in glyph_list:
                 make_overlay_glyph_page(
-                    args, page_width, page_height, font_list, glyph_name)
+                    args, page_width, page_height,
+                    fonts_by_glyph[glyph_name], glyph_name)
+                document.add_page()
 
         elif args.mode == 'gradient':
             page_width = BOX_WIDTH * len(font_list)
             page_height = BOX_HEIGHT
             output_mode = 'gradient proof'
             if len(glyph_list) > 1:
-                make_cover(page_width, page_height, font_list, margin)
+                make_cover(
+                    page_width, page_height, font_list, family_name, margin)
+                document.add_page()
+            fonts_by_glyph = get_fonts_by_glyph(
+                glyph_list, font_list, font_keys)
             for glyph_name in glyph_list:
-                make_gradient_page(page_width, page_height, glyph_name, font_list)
+                make_gradient_page(
+                    page_width, page_height,
+                    glyph_name, fonts_by_glyph[glyph_name])
+                document.add_page()
 
         else:
             # default
             bpl = get_max_boxes_per_line(args, font_list)
-            lines = math.ceil(len(font_list) / bpl)
+            lines = (len(font_list) + bpl - 1) // bpl
             page_width = BOX_WIDTH * bpl
             page_height = BOX_HEIGHT * lines
             output_mode = 'glyph proof'
+            uni_dict = make_uni_dict(font_list)
+            # baseline of each line of glyphs
+            line_offsets = [
+                page_height - (BOX_HEIGHT * i) + BOX_WIDTH * 0.4 for
+                i in range(1, lines + 1)]
             if len(glyph_list) > 1:
-                make_cover(page_width, page_height, font_list, margin)
+                make_cover(
+                    page_width, page_height, font_list, family_name, margin)
+                document.add_page()
+            # every glyph in glyph_list exists in at least one of the UFOs
             for glyph_name in glyph_list:
                 make_proof_page(
-                    args, BOX_WIDTH, BOX_HEIGHT, glyph_name, font_list)
+                    args, glyph_name, font_list, font_keys,
+                    uni_dict, bpl, page_width, page_height, line_offsets)
+                document.add_page()
 
         output_path = make_output_path(args, family_name, output_mode, matches)
 
-        db.saveImage(output_path)
+        document.save(output_path)
         print('saved PDF to', compress_user(output_path))
         subprocess.call(['open', output_path])
         db.endDrawing()
@@ -22,17 +22,21 @@ import drawBot as db
 import re
 import subprocess
 
-from fontTools.pens.boundsPen import BoundsPen
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from fontTools.ttLib import TTFont
 
 from pathlib import Path
-from proofing_helpers.drawing import draw_glyph
-from proofing_helpers.files import get_ufo_paths, get_font_paths
+from proofing_helpers.files import get_input_paths
 from proofing_helpers.globals import FONT_MONO
 from proofing_helpers.names import get_ps_name
 from proofing_helpers.stamps import timestamp
 
 
+DESKTOP_DIR = Path.home() / 'Desktop'
+SUFFIX_LABELS = {'.otf': 'OTF', '.ttf': 'TTF', '.ufo': 'UFO'}
+
+
 def get_args(args=None):
     parser = argparse.ArgumentParser(
         description=__doc__)
@@ -51,56 +55,56 @@ def get_args(args=None):
     return parser.parse_args(args)
 
 
-def get_y_bounds(glyphset):
+def get_box_path(g, glyph_container, x_center, y_baseline):
+    '''
+    get the outline of a glyph, horizontally centered on x_center
+    (all values in font units)
     '''
-    get vertical metrics for a fonttools font
+    box_path = db.BezierPath(glyphSet=glyph_container)
+    g.draw(box_path)
+    box_path.translate(x_center - g.width / 2, y_baseline)
+    return box_path
 
-    XXX this may leads to differently-scaled fonts within the
-    same family, since not all necessarily have the same bounding box.
+
+def is_empty_glyph(g, gname, glyf_table=None):
     '''
-    y_bounds = []
-    bpen = BoundsPen(glyphset)
-    for gname, glyph in glyphset.items():
-        glyph.draw(bpen)
-        _, y_bot, _, y_top = bpen.bounds
-        y_bounds.append(y_bot)
-        y_bounds.append(y_top)
-    return min(y_bounds), max(y_bounds)
-
-
-def draw_box(g, origin, box_width, box_height, upm):
-    x, y = origin
-    # f_height = y_bounds[1] - y_bounds[0]
-    # f_descender = y_bounds[0]
-    f_height = upm * 1.2
-    f_descender = upm / 3
-    scale_factor = box_height / f_height
+    check if a glyph has nothing to draw, without drawing it
+    (for fonts, the glyf table needs to be passed; CFF glyphs are never
+    considered empty, since that is only known after drawing them)
+    '''
+    if isinstance(g, defcon.Glyph):
+        # UFO
+        return not len(g) and not g.components
+    if glyf_table is not None:
+        # TrueType font (composite glyphs have -1 contours)
+        return glyf_table[gname].numberOfContours == 0
+    return False
+
+
+def draw_row(row_path, scale_factor):
     with db.savedState():
-        db.scale(
-            scale_factor, scale_factor, center=origin)
-        db.translate(*origin)
-        db.translate(
-            box_width / 2 / scale_factor - g.width / 2, abs(f_descender)
-        )
-        draw_glyph(g)
+        db.scale(scale_factor)
+        db.drawPath(row_path)
 
 
-def draw_glyphset_page(f, glyph_list):
-    width = db.sizes()['TabloidLandscape'][0]
+def draw_glyphset_page(f, glyph_list, time_str=None):
+    width, _ = db.sizes('TabloidLandscape')
     margin = 10
     whitespace_bottom = margin * 10
     glyphs_per_line = 16
     box_width = (width - 2 * margin) / glyphs_per_line
     box_height = box_width
-    lines = len(glyph_list) // glyphs_per_line + 1
+    lines = (len(glyph_list) + glyphs_per_line - 1) // glyphs_per_line
     height = lines * box_height + 2 * margin + whitespace_bottom
 
     box_x = margin
     box_y = height - margin
     db.newPage(width, height)
 
+    if time_str is None:
+        time_str = timestamp(readable=True)
     time_stamp = db.FormattedString(
-        '{}'.format(timestamp(readable=True)),
+        time_str,
         font=FONT_MONO,
         fontSize=10,
         align='right')
@@ -108,39 +112,95 @@ def draw_glyphset_page(f, glyph_list):
     text_margin = 2 * margin
     db.textBox(time_stamp, (text_margin, margin, width - 2 * text_margin, 20))
 
+    glyf_table = None
     if isinstance(f, TTFont):
         glyph_container = f.getGlyphSet()
-        # y_bounds = get_y_bounds(glyph_container)
+        if 'glyf' in f:
+            glyf_table = f['glyf']
         upm = f['head'].unitsPerEm
     else:
         glyph_container = f
-        # y_bounds = f.bounds[1], f.bounds[3]
         upm = f.info.unitsPerEm
     if not upm:
         upm = 1000
 
-    for g_index, gname in enumerate(glyph_list):
+    # the same for all glyphs on the page. The box size is derived from the
+    # UPM rather than the font's bounding box, so all fonts of a family are
+    # shown at the same scale.
+    f_height = upm * 1.2
+    f_descender = upm / 3
+    scale_factor = box_height / f_height
+    # box center and baseline, relative to the box origin, in font units
+    half_box = box_width / 2 / scale_factor
+    baseline_shift = abs(f_descender)
+
+    # all glyphs of a row are combined into a single path
+    row_path = None
+    glyphs = [(gname, glyph_container[gname]) for gname in glyph_list]
+    for g_index, (gname, glyph) in enumerate(glyphs):
         if g_index % glyphs_per_line == 0:
+            if row_path:
+                draw_row(row_path, scale_factor)
+            row_path = db.BezierPath()
             box_x = margin
             box_y -= box_height
-        origin = box_x, box_y
-        glyph = glyph_container[gname]
-        draw_box(glyph, origin, box_width, box_height, upm)
+        if is_empty_glyph(glyph, gname, glyf_table):
+            # the grid position is kept
+            box_x += box_width
+            continue
+        row_path.appendPath(get_box_path(
+            glyph, glyph_container,
+            box_x / scale_factor + half_box,
+            box_y / scale_factor + baseline_shift))
         # draw boxes
         # with db.savedState():
         #     db.fill(None)
         #     db.stroke(0)
         #     db.strokeWidth(.5)
-        #     db.rect(*origin, box_width, box_height)
+        #     db.rect(box_x, box_y, box_width, box_height)
         box_x += box_width
 
+    if row_path:
+        draw_row(row_path, scale_factor)
 
-def filter_glyph_list(regex_string, glyph_list):
+
+def get_required_literal(regex_string):
+    '''
+    Find the longest literal string which every match of a simple regular
+    expression must contain. Patterns with groups, character classes,
+    alternatives, repetition counts or escapes return None.
     '''
-    filter list of glyphs by regular expression
+    if set(regex_string) & set('()[]{}|\\'):
+        return None
+    literals = []
+    current = ''
+    for char in regex_string:
+        if char in '*?':
+            # the previous character is optional
+            literals.append(current[:-1])
+            current = ''
+        elif char in '.^$+':
+            literals.append(current)
+            current = ''
+        else:
+            current += char
+    literals.append(current)
+    longest = max(literals, key=len)
+    return longest or None
+
+
+def filter_glyph_list(reg_ex, glyph_list):
     '''
-    reg_ex = re.compile(regex_string)
-    matches = list(filter(reg_ex.match, glyph_list))
+    filter list of glyphs by (compiled) regular expression
+    '''
+    literal = get_required_literal(reg_ex.pattern)
+    if literal:
+        # a substring test is much cheaper than the regular expression
+        matches = [
+            gname for gname in glyph_list if
+            literal in gname and reg_ex.match(gname)]
+    else:
+        matches = [gname for gname in glyph_list if reg_ex.match(gname)]
     if matches:
         print('filtered glyph list:')
         print(' '.join(matches))
@@ -158,12 +218,14 @@ def make_output_name(input_file, args):
         name.insert(0, 'filtered')
 
     name.append(get_ps_name(input_file))
-    name.append(f'({input_file.suffix.lstrip(".").upper()})')
+    suffix = input_file.suffix
+    label = SUFFIX_LABELS.get(suffix) or suffix.lstrip('.').upper()
+    name.append(f'({label})')
 
     return ' '.join(name) + '.pdf'
 
 
-def make_glyphset_pdf(args, input_file):
+def make_glyphset_pdf(args, input_file, reg_ex=None, time_str=None):
     db.newDrawing()
     if input_file.suffix == '.ufo':
         f = defcon.Font(input_file)
@@ -172,18 +234,18 @@ def make_glyphset_pdf(args, input_file):
         f = TTFont(input_file)
         complete_glyph_order = f.getGlyphOrder()
 
-    if args.regex:
-        glyph_list = filter_glyph_list(args.regex, complete_glyph_order)
+    if reg_ex:
+        glyph_list = filter_glyph_list(reg_ex, complete_glyph_order)
     else:
         glyph_list = complete_glyph_order
 
     output_name = make_output_name(input_file, args)
-    output_path = Path(f'~/Desktop/{output_name}').expanduser()
+    output_path = DESKTOP_DIR / output_name
 
-    draw_glyphset_page(f, glyph_list)
+    draw_glyphset_page(f, glyph_list, time_str)
     db.saveImage(output_path)
     db.endDrawing()
-    subprocess.call(['open', output_path])
+    return output_path
 
 
 def main(test_args=None):
@@ -192,11 +254,23 @@ def main(test_args=None):
     # collect input files
     input_list = []
     for input_path in args.input:
-        input_list.extend(get_ufo_paths(input_path))
-        input_list.extend(get_font_paths(input_path))
-
-    for input_file in input_list:
-        make_glyphset_pdf(args, input_file)
+        ufo_paths, font_paths = get_input_paths(input_path)
+        input_list.extend(ufo_paths)
+        input_list.extend(font_paths)
+
+    # the regular expression is compiled once for all input files
+    reg_ex = re.compile(args.regex) if args.regex else None
+    # all PDFs of a run share the same timestamp
+    time_str = timestamp(readable=True)
+    # every input file is proofed to a separate PDF, in parallel
+    with ProcessPoolExecutor() as executor:
+        make_pdf = partial(
+            make_glyphset_pdf, args, reg_ex=reg_ex, time_str=time_str)
+        output_paths = list(executor.map(make_pdf, input_list))
+
+    if output_paths:
+        # open accepts several files at once
+        subprocess.Popen(['open'] + output_paths)
 
 
 if __name__ == '__main__':
@@ -16,7 +16,15 @@ import ast
 import os
 
 
-def make_doc_snippet(file_name):
+def get_image_files(image_dir='_images/'):
+    '''
+    Sorted list of all PNG files in the _images folder (read only once).
+    '''
+    return sorted([
+        img for img in os.listdir(image_dir) if img.endswith('.png')])
+
+
+def make_doc_snippet(file_name, all_image_files):
     '''
     Read the doc string of a Python script, and return it in markdown format.
     If an image file (corresponding to the script name) exists in an _images
@@ -24,13 +32,13 @@ def make_doc_snippet(file_name):
     '''
     doc_snippet = None
     base_name, suffix = os.path.splitext(file_name)
-    # very simple way of looking for related images
-    image_files = sorted([
-        img for img in os.listdir('_images/') if img.startswith(base_name) and
-        img.endswith('.png')])
 
     if suffix == '.py':
-        body = ast.parse(''.join(open(file_name)))
+        # very simple way of looking for related images
+        image_files = [
+            img for img in all_image_files if img.startswith(base_name)]
+        with open(file_name, 'rb') as py_file:
+            body = ast.parse(py_file.read())
         docstring = ast.get_docstring(body)
 
         if docstring:
@@ -81,9 +89,10 @@ if __name__ == '__main__':
 
     output = []
     output.append(header)
+    all_image_files = get_image_files()
 
     for file_name in sorted(os.listdir('.')):
-        doc_snippet = make_doc_snippet(file_name)
+        doc_snippet = make_doc_snippet(file_name, all_image_files)
         if doc_snippet:
             output.append(doc_snippet)
 
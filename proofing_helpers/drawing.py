@@ -7,21 +7,64 @@
 
 import defcon
 import drawBot as db
-from fontParts import fontshell
 from fontTools.pens.cocoaPen import CocoaPen
 
+COCOA_PATH_REPRESENTATION = 'drawBotProofing.cocoaPath'
+
+
+def cocoa_path_factory(glyph):
+    '''
+    defcon representation factory: the outline of a UFO glyph as NSBezierPath
+    '''
+    cpen = CocoaPen(glyph.getParent())
+    glyph.draw(cpen)
+    return cpen.path
+
+
+# defcon caches the path on the glyph, until the glyph is changed
+defcon.registerRepresentationFactory(
+    defcon.Glyph, COCOA_PATH_REPRESENTATION, cocoa_path_factory)
+
+# paths of fontTools glyphs, keyed by (id(glyph set), glyph name).
+# the glyph set is stored along with the path, so its id is not reused.
+_glyph_path_cache = {}
+
+
+def clear_glyph_cache():
+    '''
+    forget the cached paths of fontTools glyphs (and their glyph sets)
+    '''
+    _glyph_path_cache.clear()
+
 
 def draw_glyph(glyph):
     '''
     global drawing method, which allows passing either UFO- or fontTools glyphs
     '''
-    if isinstance(
-        glyph, (defcon.objects.glyph.Glyph, fontshell.glyph.RGlyph)
-    ):
+    # defcon and fontParts glyphs have representations, fontTools glyphs don’t
+    get_representation = getattr(glyph, 'getRepresentation', None)
+    if get_representation:
         # UFO
-        cpen = CocoaPen(glyph.getParent())
+        path = get_representation(COCOA_PATH_REPRESENTATION)
     else:
         # font
-        cpen = CocoaPen(glyph.glyphSet)
-    glyph.draw(cpen)
-    db.drawPath(cpen.path)
+        cache_key = (id(glyph.glyphSet), glyph.name)
+        if cache_key in _glyph_path_cache:
+            _, path = _glyph_path_cache[cache_key]
+        else:
+            cpen = CocoaPen(glyph.glyphSet)
+            glyph.draw(cpen)
+            path = cpen.path
+            _glyph_path_cache[cache_key] = glyph.glyphSet, path
+    db.drawPath(path)
+
+
+def draw_horizontal_lines(y_values, x_start, x_end):
+    '''
+    draw horizontal lines for a number of y values as a single path
+    '''
+    line_path = db.BezierPath()
+    for y_value in y_values:
+        line_path.moveTo((x_start, y_value))
+        line_path.lineTo((x_end, y_value))
+    db.drawPath(line_path)
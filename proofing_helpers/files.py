@@ -13,6 +13,36 @@ from fontTools.designspaceLib import DesignSpaceDocument
 from pathlib import Path
 
 
+def walk_input_dir(path):
+    '''
+    Walk a directory once, and sort UFO, OTF and TTF paths into three lists.
+    UFO folders are not walked into. Suffixes are matched case-insensitively,
+    macOS AppleDouble files (._*) are skipped.
+
+    '''
+    ufo_paths = []
+    otf_paths = []
+    ttf_paths = []
+    # os.walk is based on os.scandir, and does not stat every file
+    for root, dir_names, file_names in os.walk(path):
+        root_path = Path(root)
+        for dir_name in dir_names:
+            if dir_name.lower().endswith('.ufo'):
+                ufo_paths.append(root_path / dir_name)
+        # no need to walk through the .glif files
+        dir_names[:] = [
+            dn for dn in dir_names if not dn.lower().endswith('.ufo')]
+        for file_name in file_names:
+            if file_name.startswith('._'):
+                continue
+            suffix = os.path.splitext(file_name)[1].lower()
+            if suffix == '.otf':
+                otf_paths.append(root_path / file_name)
+            elif suffix == '.ttf':
+                ttf_paths.append(root_path / file_name)
+    return ufo_paths, otf_paths, ttf_paths
+
+
 def get_font_paths(input_path):
     '''
     Search for font files.
@@ -32,11 +62,10 @@ def get_font_paths(input_path):
 
     if path.is_dir():
         # directory was passed
-        otf_paths = list(path.rglob('*.otf'))
-        ttf_paths = list(path.rglob('*.ttf'))
+        _, otf_paths, ttf_paths = walk_input_dir(path)
     else:
         # single file was passed
-        if path.suffix in ['.otf', '.ttf']:
+        if path.suffix.lower() in ['.otf', '.ttf']:
             return [path]
 
     if otf_paths:
@@ -58,7 +87,7 @@ def get_ufo_paths(input_path, filter='font.ufo'):
         if path.suffix == '.ufo':
             return [path]
         else:
-            ufo_paths = list(path.rglob('*.ufo'))
+            ufo_paths, _, _ = walk_input_dir(path)
     elif path.suffix == '.designspace':
         doc = DesignSpaceDocument.fromfile(path)
         for source in doc.sources:
@@ -67,6 +96,25 @@ def get_ufo_paths(input_path, filter='font.ufo'):
     return ufo_paths
 
 
+def get_input_paths(input_path):
+    '''
+    Search for UFO- and font files in a single walk of the file system.
+    Return a tuple of (ufo_paths, font_paths), following the same rules as
+    get_ufo_paths and get_font_paths. UFO folders are not searched for fonts.
+
+    '''
+    path = Path(input_path).resolve()
+    if not path.is_dir():
+        return get_ufo_paths(path), get_font_paths(path)
+    if path.suffix == '.ufo':
+        return [path], []
+
+    ufo_paths, otf_paths, ttf_paths = walk_input_dir(path)
+    if otf_paths:
+        return ufo_paths, otf_paths
+    return ufo_paths, ttf_paths
+
+
 def read_text_file(text_file):
     '''
     Read text file and filter out empty lines and comments.
@@ -75,9 +123,10 @@ def read_text_file(text_file):
     '''
     try:
         with open(text_file, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
+            # lines are filtered as they are read
+            stripped_lines = (line.rstrip('\n') for line in f)
             content = '\n'.join(
-                line for line in raw_content.split('\n') if
+                line for line in stripped_lines if
                 line and not line[0] == '#')
         return content
 
@@ -92,7 +141,7 @@ def chain_charset_texts(cs_prefix='AL', cs_level=3):
 
     '''
     max_charset_level = int(cs_level)
-    raw_content = ''
+    contents = []
     content_dir = Path(__file__).parents[1].joinpath('_content')
 
     for level in (range(max_charset_level, -1, -1)):
@@ -101,17 +150,17 @@ def chain_charset_texts(cs_prefix='AL', cs_level=3):
                 text_file_name = f'{content_dir}/ASCII.txt'
             else:
                 # do not add ASCII to Cyrillic or Greek
-                pass
+                continue
         else:
             text_file_name = f'{content_dir}/{cs_prefix.upper()}{level}.txt'
 
         try:
             with open(text_file_name, 'r', encoding='utf-8') as f:
-                raw_content += f.read()
+                contents.append(f.read())
         except FileNotFoundError:
             print(f'file not found: {text_file_name}')
             continue
-    return raw_content
+    return ''.join(contents)
 
 
 def get_temp_file_path(extension=None):
@@ -120,24 +169,24 @@ def get_temp_file_path(extension=None):
     return path
 
 
-def make_temp_font(file_index, font_file):
+def make_temp_font(file_index, font_file, font=None):
     '''
     Make a temporary font file with a unique PS name, so two versions of the
     same design can be embedded into the same PDF.
     If PS names clash, the implication is that the same font outlines will be
     seen throughout the whole document.
+    An already-open TTFont of font_file may be passed (its PS name changes).
     '''
-    font = ttLib.TTFont(font_file)
+    if font is None:
+        # only the name table changes, all other tables are copied as they are
+        font = ttLib.TTFont(
+            font_file, recalcBBoxes=False, recalcTimestamp=False)
     file_extension = '.otf' if font.sfntVersion == 'OTTO' else '.ttf'
     tmp_font_file = get_temp_file_path(file_extension)
     tmp_ps_name = f'{Path(font_file).stem}_{file_index}'
     for name_entry in font['name'].names:
         if name_entry.nameID == 6:
-            font['name'].setName(
-                tmp_ps_name,
-                nameID=6,
-                platformID=name_entry.platformID,
-                platEncID=name_entry.platEncID,
-                langID=name_entry.langID)
+            # the string is encoded for each record when the font is saved
+            name_entry.string = tmp_ps_name
     font.save(tmp_font_file)
     return(tmp_font_file)
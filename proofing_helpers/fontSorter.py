@@ -5,10 +5,13 @@
 # accordance with the terms of the Adobe license agreement accompanying
 # it.
 
+import functools
 import re
 
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 from pathlib import Path
+from .files import walk_input_dir
 from .names import get_ps_name
 
 opsz_names = [
@@ -61,6 +64,37 @@ DEFAULT_SCORE = (
     weight_names.index('regular'))
 
 
+def make_attr_patterns(attr_list):
+    '''
+    Compile a search pattern for each style name of an attribute list.
+    Return a flat list of (attr_list index, compiled pattern) tuples.
+    '''
+    attr_patterns = []
+    for index, variant in enumerate(attr_list):
+        # lists of equivalent variants (like Cnd and Condensed), or
+        # simple style names, like Regular
+        sub_variants = variant if isinstance(variant, list) else [variant]
+        for sub_variant in sub_variants:
+            attr_patterns.append(
+                (index, re.compile(re.escape(sub_variant), re.IGNORECASE)))
+    return attr_patterns
+
+
+# all patterns are compiled once, when the module is loaded
+OPSZ_PATTERNS = make_attr_patterns(opsz_names)
+WIDTH_PATTERNS = make_attr_patterns(width_names)
+WEIGHT_PATTERNS = make_attr_patterns(weight_names)
+ITALIC_RX = re.compile(r'.*(it)(alic)?.*', re.IGNORECASE)
+INDEX_RX = re.compile(r'.+?(\d+?)$')
+ALL_ATTRS = (
+    list(chain.from_iterable(opsz_names)) +
+    list(chain.from_iterable(width_names)) +
+    weight_names + ['Italic', 'Ita', 'It'])
+# a single alternation finds any attribute in one pass over the PS name
+OUTLIER_RX = re.compile(
+    '|'.join(re.escape(attr) for attr in ALL_ATTRS), re.IGNORECASE)
+
+
 def find_longest_match(attr_list, match_indices):
     found_names = [
         (len(name), name) for (name_index, name) in enumerate(attr_list) if
@@ -77,33 +111,24 @@ def make_psname_dict(font_files):
     The dict values are lists, because multiple fonts might have the
     same PS name.
     '''
+    # reading the names is mostly waiting for the disk, so fonts are read
+    # in parallel threads
+    with ThreadPoolExecutor(max_workers=min(32, len(font_files))) as executor:
+        psnames = list(executor.map(get_ps_name, font_files))
+
     psname_dict = {}
-    for font_file in font_files:
-        psname = get_ps_name(font_file)
+    for font_file, psname in zip(font_files, psnames):
         psname_dict.setdefault(psname, []).append(font_file)
     return psname_dict
 
 
-def get_attr_score(ps_name, attr_list, fallback):
+def get_attr_score(ps_name, attr_list, attr_patterns, fallback):
     '''
     Get score for one specific attribute
     (opsz, width, weight)
     '''
-    name_matches = []
-    for index, variant in enumerate(attr_list):
-        if isinstance(variant, list):
-            # lists of equivalent variants (like Cnd and Condensed)
-            for sub_variant in variant:
-                rx = re.compile(
-                    rf'(.+?)?({sub_variant})(.+?)?', re.IGNORECASE)
-                if re.match(rx, ps_name):
-                    name_matches.append(index)
-        else:
-            # simple style names, like Regular
-            rx = re.compile(
-                rf'(.+?)?({variant})(.+?)?', re.IGNORECASE)
-            if re.match(rx, ps_name):
-                name_matches.append(index)
+    name_matches = [
+        index for index, rx in attr_patterns if rx.search(ps_name)]
 
     if name_matches:
         score = find_longest_match(attr_list, name_matches)
@@ -115,7 +140,7 @@ def get_attr_score(ps_name, attr_list, fallback):
 def get_italic_score(ps_name):
     # Does the PS name contain Italic?
     it_score = 0
-    italic_match = re.match(r'.*(it)(alic)?.*', ps_name, re.IGNORECASE)
+    italic_match = ITALIC_RX.match(ps_name)
     if italic_match:
         it_score = 1
     return it_score
@@ -124,7 +149,7 @@ def get_italic_score(ps_name):
 def get_index_score(ps_name):
     # A PS name may contain an index number -- return it if it exists
     index_score = 0
-    index_match = re.match(r'.+?(\d+?)$', ps_name)
+    index_match = INDEX_RX.match(ps_name)
     if index_match:
         index_score = int(index_match.group(1))
     return index_score
@@ -135,24 +160,10 @@ def test_outlier(ps_name):
     Check if any of the given attributes match the ps name.
     If not, the name cannot be sorted (e.g. Acumin-Whatever).
     '''
-    all_attrs = (
-        list(chain.from_iterable(opsz_names)) +
-        list(chain.from_iterable(width_names)) +
-        weight_names + ['Italic', 'Ita', 'It'])
-    if not any([
-        re.match(rf'(.+?)?({attr})(.+?)?', ps_name, re.IGNORECASE) for
-        attr in all_attrs
-    ]):
-        return True
-    return False
-
-
-def make_hash(opsz_score, width_score, weight_score, index_score, it_score):
-    return (
-        f'{opsz_score:03d}{width_score:03d}'
-        f'{weight_score:03d}{index_score:02d}{it_score}')
+    return OUTLIER_RX.search(ps_name) is None
 
 
+@functools.lru_cache(maxsize=None)
 def get_score(ps_name, alternate_italics=False):
     '''
     calculcate a score for a given PS name, consisting of
@@ -161,19 +172,23 @@ def get_score(ps_name, alternate_italics=False):
     If Italics are supposed to be inserted between the styles, the score is
     opsz, width, weight, index (italic attribute is counted as part of weigh)
 
+    The score is a tuple, which sorts like the scores it consists of.
     For example:
 
-    006004007000 AcuminPro-Regular
-    006 = opsz
-    004 = wdth
-    007 = wght
-    00 = index
+    (6, 4, 7, 0, 0) AcuminPro-Regular
+    6 = opsz
+    4 = wdth
+    7 = wght
+    0 = index
     0 = italic
     '''
 
-    opsz_score = get_attr_score(ps_name, opsz_names, ['normal'])
-    width_score = get_attr_score(ps_name, width_names, ['normal'])
-    weight_score = get_attr_score(ps_name, weight_names, 'regular')
+    opsz_score = get_attr_score(
+        ps_name, opsz_names, OPSZ_PATTERNS, ['normal'])
+    width_score = get_attr_score(
+        ps_name, width_names, WIDTH_PATTERNS, ['normal'])
+    weight_score = get_attr_score(
+        ps_name, weight_names, WEIGHT_PATTERNS, 'regular')
     index_score = get_index_score(ps_name)
     it_score = get_italic_score(ps_name)
 
@@ -188,32 +203,18 @@ def get_score(ps_name, alternate_italics=False):
             width_score = 999
             weight_score = 999
 
-    style_hash = make_hash(
-        opsz_score, width_score, weight_score,
-        index_score, it_score)
-
-    return style_hash
+    return (opsz_score, width_score, weight_score, index_score, it_score)
 
 
 def sort_ps_names(ps_name_list, alternate_italics=False, debug=False):
     '''
     Sort a list of PS names according to a hard-coded list of style names.
     '''
-
-    matches = {}
-    for ps_name in ps_name_list:
-        style_hash = get_score(ps_name, alternate_italics)
-        # matches.setdefault(ps_name, []).append(int(style_hash))
-        matches.setdefault(int(style_hash), []).append(ps_name)
-
-    # make sure the matches are sorted alphabetically per-style,
+    # names of the same style are sorted alphabetically,
     # in case more than one family is sorted
-    for score, font_list in matches.items():
-        font_list.sort()
-    # score_dict = {min(score_list): f for f, score_list in matches.items()}
-
-    sorted_name_lists = [f for _, f in sorted(matches.items())]
-    sorted_names = list(chain.from_iterable(sorted_name_lists))
+    sorted_names = sorted(
+        ps_name_list,
+        key=lambda ps_name: (get_score(ps_name, alternate_italics), ps_name))
 
     return sorted_names
 
@@ -233,9 +234,8 @@ def sort_fonts(font_files, alternate_italics=False, debug=False):
 
 
 def get_font_paths(directory):
-    ufo_paths = list(directory.rglob('*.ufo'))
-    otf_paths = list(directory.rglob('*.otf'))
-    ttf_paths = list(directory.rglob('*.ttf'))
+    # a single walk of the directory tree finds all three kinds of files
+    ufo_paths, otf_paths, ttf_paths = walk_input_dir(directory)
 
     if ufo_paths:
         return ufo_paths
@@ -5,14 +5,17 @@
 # accordance with the terms of the Adobe license agreement accompanying
 # it.
 
+import functools
 import plistlib
 from fontTools import ttLib
 
 
+@functools.lru_cache(maxsize=None)
 def get_ps_name(input_file):
     '''
     Return the PS name for a font or UFO.
     If the UFO PS name is not filled in, synthesize it.
+    The result is cached per path, since the file needs to be parsed.
     '''
     if input_file.suffix == '.ufo':
 
@@ -0,0 +1,81 @@
+# Copyright 2023 Adobe
+# All Rights Reserved.
+
+# NOTICE: Adobe permits you to use, modify, and distribute this file in
+# accordance with the terms of the Adobe license agreement accompanying
+# it.
+
+import os
+
+import drawBot as db
+from Foundation import NSURL
+from Quartz import PDFDocument
+
+from .files import get_temp_file_path
+
+PAGES_PER_CHUNK = 50
+
+
+def join_pdfs(pdf_paths, output_path):
+    '''
+    Join the pages of a number of PDF files into a single PDF file.
+    '''
+    joined_doc = PDFDocument.alloc().init()
+    # the source documents need to stay alive until the file is written
+    source_docs = []
+    for pdf_path in pdf_paths:
+        source_doc = PDFDocument.alloc().initWithURL_(
+            NSURL.fileURLWithPath_(os.fspath(pdf_path)))
+        source_docs.append(source_doc)
+        for page_index in range(source_doc.pageCount()):
+            joined_doc.insertPage_atIndex_(
+                source_doc.pageAtIndex_(page_index),
+                joined_doc.pageCount())
+    joined_doc.writeToFile_(os.path.expanduser(output_path))
+
+
+class ChunkedDocument(object):
+    '''
+    Write a long drawing to disk in chunks of pages, so not all pages need to
+    be kept in memory at the same time. The chunks are joined when the
+    document is saved.
+
+    Call add_page() after each page has been drawn.
+    '''
+
+    def __init__(self, pages_per_chunk=PAGES_PER_CHUNK):
+        self.pages_per_chunk = pages_per_chunk
+        self.pages_in_chunk = 0
+        self.chunk_paths = []
+
+    def write_chunk(self):
+        chunk_path = get_temp_file_path('.pdf')
+        db.saveImage(chunk_path)
+        db.endDrawing()
+        db.newDrawing()
+        self.chunk_paths.append(chunk_path)
+        self.pages_in_chunk = 0
+
+    def add_page(self):
+        self.pages_in_chunk += 1
+        if self.pages_in_chunk >= self.pages_per_chunk:
+            self.write_chunk()
+
+    def save(self, output_path):
+        '''
+        Save the document. If no chunk has been written yet, the drawing
+        is saved directly.
+        '''
+        output_path = os.path.expanduser(output_path)
+        if not self.chunk_paths:
+            db.saveImage(output_path)
+            return
+
+        if self.pages_in_chunk:
+            self.write_chunk()
+
+        join_pdfs(self.chunk_paths, output_path)
+
+        for chunk_path in self.chunk_paths:
+            os.remove(chunk_path)
+        self.chunk_paths = []
@@ -7,6 +7,10 @@
 
 import time
 
+# date and time formats, joined by the connector
+FORMAT_READABLE = ('%Y/%m/%d', '%H:%M:%S')
+FORMAT_FILE_NAME = ('%Y-%m-%d', '%H%M%S')
+
 
 def timestamp(readable=False, connector=' '):
     '''
@@ -15,15 +19,12 @@ def timestamp(readable=False, connector=' '):
 
     The connector argument is the character which connects date and time.
     '''
-    local_time = time.localtime()
-
     if readable:
-        conn_date = '/'
-        conn_time = ':'
+        date_format, time_format = FORMAT_READABLE
     else:
-        conn_date = '-'
-        conn_time = ''
-    stamp_date = time.strftime(f'%Y{conn_date}%m{conn_date}%d', local_time)
-    stamp_time = time.strftime(f'%H{conn_time}%M{conn_time}%S', local_time)
+        date_format, time_format = FORMAT_FILE_NAME
+    # the connector is escaped, in case it contains a percent sign
+    stamp_format = connector.replace('%', '%%').join(
+        (date_format, time_format))
 
-    return f'{stamp_date}{connector}{stamp_time}'
+    return time.strftime(stamp_format, time.localtime())
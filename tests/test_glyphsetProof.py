@@ -0,0 +1,93 @@
+# Copyright 2023 Adobe
+# All Rights Reserved.
+
+# NOTICE: Adobe permits you to use, modify, and distribute this file in
+# accordance with the terms of the Adobe license agreement accompanying
+# it.
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('fontTools')
+pytest.importorskip('defcon')
+db = pytest.importorskip('drawBot')
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+
+mod_dir = os.path.join(os.path.dirname(__file__), '..')
+if mod_dir not in sys.path:
+    sys.path.append(mod_dir)
+
+import glyphsetProof
+
+
+def make_box_glyph():
+    pen = TTGlyphPen(None)
+    pen.moveTo((100, 0))
+    pen.lineTo((100, 700))
+    pen.lineTo((500, 700))
+    pen.lineTo((500, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+@pytest.fixture
+def ttf(tmp_path):
+    '''
+    TrueType font with an empty glyph (space) between two box glyphs
+    '''
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(['.notdef', 'space', 'A'])
+    fb.setupCharacterMap({0x20: 'space', 0x41: 'A'})
+    fb.setupGlyf({
+        '.notdef': make_box_glyph(),
+        'space': TTGlyphPen(None).glyph(),
+        'A': make_box_glyph(),
+    })
+    fb.setupHorizontalMetrics({
+        '.notdef': (600, 100),
+        'space': (250, 0),
+        'A': (600, 100),
+    })
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': 'Test', 'styleName': 'Regular'})
+    fb.setupOS2()
+    fb.setupPost()
+    font_path = tmp_path / 'Test-Regular.ttf'
+    fb.save(font_path)
+    # read the font back, so the glyf table is decompiled from binary data
+    return TTFont(font_path)
+
+
+def test_is_empty_glyph_ttf(ttf):
+    glyph_set = ttf.getGlyphSet()
+    glyf_table = ttf['glyf']
+    assert glyphsetProof.is_empty_glyph(
+        glyph_set['space'], 'space', glyf_table)
+    assert not glyphsetProof.is_empty_glyph(glyph_set['A'], 'A', glyf_table)
+
+
+def test_draw_glyphset_page_skips_empty_ttf_glyph(ttf, monkeypatch):
+    drawn_glyphs = []
+    get_box_path = glyphsetProof.get_box_path
+
+    def recording_get_box_path(g, glyph_container, x_center, y_baseline):
+        drawn_glyphs.append((g.name, x_center))
+        return get_box_path(g, glyph_container, x_center, y_baseline)
+
+    monkeypatch.setattr(glyphsetProof, 'get_box_path', recording_get_box_path)
+
+    db.newDrawing()
+    glyphsetProof.draw_glyphset_page(ttf, ttf.getGlyphOrder(), 'time')
+    db.endDrawing()
+
+    drawn_names = [gname for gname, _ in drawn_glyphs]
+    assert drawn_names == ['.notdef', 'A']
+    # the empty glyph keeps its box, so A is two boxes right of .notdef.
+    # in font units, a box is as wide as 1.2 em.
+    (_, x_notdef), (_, x_a) = drawn_glyphs
+    assert x_a - x_notdef == pytest.approx(2 * 1.2 * 1000)
@@ -44,9 +44,13 @@ from proofing_helpers.stamps import timestamp
 
 DOC_SIZE = 'Letter'
 MARGIN = 12
+# do not split if a number or capital letter precedes the period
+SENTENCE_SPLIT_RX = re.compile(r'((?<!\d|[A-Z])[\.:])')
 
 
 class TextContainer(object):
+    __slots__ = ('text', 'italic', 'paragraph')
+
     def __init__(self, text, italic=False, paragraph=False):
         self.text = text.strip()
         self.italic = italic
@@ -137,19 +141,27 @@ def merge_chunks(chunks, chunk_length=5):
     return output
 
 
-def consume_charset(content_list, charset):
+def make_paragraph_index(content_list):
     '''
-    Keep collecting paragraphs until every character of a given charset has
-    been used.
+    Map each character to the list of paragraphs containing it.
     '''
-    character = random.choice(list(charset))
-    found_paragraphs = [p for p in content_list if character in p]
-    if found_paragraphs:
-        paragraph_pick = random.choice(found_paragraphs)
-        remaining_charset = set(charset) - set(paragraph_pick)
-    else:
-        paragraph_pick, remaining_charset = consume_charset(
-            content_list, charset)
+    paragraph_index = {}
+    for paragraph in content_list:
+        for character in set(paragraph):
+            paragraph_index.setdefault(character, []).append(paragraph)
+    return paragraph_index
+
+
+def consume_charset(paragraph_index, charset):
+    '''
+    Pick a paragraph for a random character of a given charset, and return it
+    along with the characters which have not been used yet.
+    Only characters found in the source text are picked.
+    '''
+    findable_characters = [c for c in charset if c in paragraph_index]
+    character = random.choice(findable_characters)
+    paragraph_pick = random.choice(paragraph_index[character])
+    remaining_charset = charset - set(paragraph_pick)
 
     return paragraph_pick, remaining_charset
 
@@ -166,8 +178,8 @@ def analyze_missing(content_pick, content_list, charset):
     '''
     abc = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
     missing_abc = set(abc) - set(''.join(content_pick))
-    missing_charset = set(charset) - set(''.join(content_pick))
-    missing_cset_source = set(charset) - set(''.join(content_list))
+    missing_charset = charset - set(''.join(content_pick))
+    missing_cset_source = charset - set(''.join(content_list))
 
     message_with_charset(charset_name.upper(), charset)
 
@@ -288,18 +300,19 @@ def make_page(fs, font_pri, font_sec, args):
 def format_content(content_list, len_limit=None, capitalize=False):
     total_length = 0
     formatted_content = []
+    rnd = random.random
     for paragraph in content_list:
         if capitalize:
             paragraph = paragraph.upper()
-        # do not split if a number or capital letter precedes the period
-        raw_chunks = re.split(r'((?<!\d|[A-Z])[\.:])', paragraph)
+        raw_chunks = SENTENCE_SPLIT_RX.split(paragraph)
         chunks = merge_chunks(raw_chunks)
         for chunk in chunks:
-            total_length += len(chunk)
+            chunk_length = len(chunk)
+            total_length += chunk_length
             t_container = TextContainer(chunk)
-            if len(chunk) > 140 and random.random() > 0.75:
+            if chunk_length > 140 and rnd() > 0.75:
                 t_container.paragraph = True
-            if random.random() < 0.6:
+            if rnd() < 0.6:
                 t_container.italic = True
             formatted_content.append(t_container)
 
@@ -313,8 +326,18 @@ def filter_paragraphs(content_list, req_chars):
     '''
     find paragraph(s) containing all or (at least) one required character
     '''
+    # indices of the paragraphs containing each of the required characters
+    # (taken from a copy, since paragraphs are inserted into content_list)
+    paragraphs = tuple(content_list)
+    req_set = set(req_chars)
+    char_index = {char: set() for char in req_set}
+    for p_index, paragraph in enumerate(paragraphs):
+        for char in req_set.intersection(paragraph):
+            char_index[char].add(p_index)
+
     paragraphs_containing_all = [
-        p for p in content_list if set(p) >= set(req_chars)
+        paragraphs[p_index] for p_index in
+        sorted(set.intersection(*char_index.values()))
     ]
     if paragraphs_containing_all:
         # paragraph(s) containing all characters have been found
@@ -330,7 +353,8 @@ def filter_paragraphs(content_list, req_chars):
         for c_index, char in enumerate(req_chars):
             # paragraphs for individual characters have been found
             paragraphs_containing_one = [
-                p for p in content_list if char in p]
+                paragraphs[p_index] for p_index in
+                sorted(char_index[char])]
             if paragraphs_containing_one:
                 req_paragraph = random.choice(
                     paragraphs_containing_one)
@@ -370,16 +394,19 @@ def get_content_list(charset_name):
 
 
 def validate_charset(charset_name):
+    '''
+    Return the characters of a given charset as a frozenset, for fast
+    membership tests and set operations.
+    '''
     try:
-        target_charset = eval(f'cs.{charset_name.lower()}')
-    except NameError:
+        target_charset = getattr(cs, charset_name.lower())
+    except AttributeError:
         sys.exit(f'Character set "{charset_name}" is not defined')
-    return target_charset
+    return frozenset(target_charset)
 
 
-def get_glyphs_per_page(font, pt_size):
+def get_glyphs_per_page(ttfont, pt_size):
 
-    ttfont = TTFont(font)
     avg_glyph_width = ttfont['OS/2'].xAvgCharWidth
     upm = ttfont['head'].unitsPerEm
 
@@ -423,17 +450,20 @@ def make_formatted_content(
     len_limit=None, char_filter=None, capitalize=False, full=False
 ):
     if full:
+        # the paragraphs containing each character are only looked up once
+        paragraph_index = make_paragraph_index(content_list)
         # Some characters are hard to find, so the source text might not
         # contain all of the characters for the given charset.
-        acceptable_omissions = len(
-            set(charset) - set(''.join(content_list)))
+        acceptable_omissions = len(charset - paragraph_index.keys())
 
         full_content = []
         remaining_charset = charset
 
+        # Keep collecting paragraphs until every character of the charset
+        # (which is contained in the source text) has been used.
         while len(remaining_charset) > acceptable_omissions:
             paragraph, remaining_charset = consume_charset(
-                content_list, remaining_charset)
+                paragraph_index, remaining_charset)
             full_content.append(paragraph)
 
         formatted_content = format_content(full_content, capitalize)
@@ -470,9 +500,12 @@ if __name__ == '__main__':
     temp_fonts = {}
     for i, font in enumerate(fonts_pri + fonts_sec):
         # Make temporary fonts, and calculate how many glyphs of the given
-        # font may fit on a page
-        temp_fonts[font] = make_temp_font(i, font)
-        gpp_count += get_glyphs_per_page(font, args.pt_size)
+        # font may fit on a page. Each font is only opened once, and only
+        # the tables which are accessed (OS/2, head, name) are decompiled.
+        ttfont = TTFont(
+            font, lazy=True, recalcBBoxes=False, recalcTimestamp=False)
+        gpp_count += get_glyphs_per_page(ttfont, args.pt_size)
+        temp_fonts[font] = make_temp_font(i, font, ttfont)
 
     # This is not completely representative of the # of glyphs/page,
     # but it is a useful approximation.
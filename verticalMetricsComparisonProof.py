@@ -18,25 +18,28 @@ import drawBot as db
 
 from verticalMetricsProof import (
     MARGIN, PT_SIZE,
-    FontInfo,
-    finish_drawing, get_options)
+    finish_drawing, get_font_infos, get_options)
 
 from proofing_helpers import fontSorter
-from proofing_helpers.files import get_font_paths, get_ufo_paths
-from proofing_helpers.drawing import draw_glyph
+from proofing_helpers.files import get_input_paths
+from proofing_helpers.drawing import draw_glyph, draw_horizontal_lines
 from proofing_helpers.globals import FONT_MONO
+from proofing_helpers.pages import ChunkedDocument
 
 
 EXAMPLE_CHARS = list('Hnxphlg')
 
 
-def draw_metrics_page_ufo(character, fo_list, cmap_list, page_width=1000):
+def draw_metrics_page_ufo(
+    character, fo_list, cmap_list, scale_list, label_list, page_width=1000
+):
 
     db.newPage(page_width, 250)
     x_offset = MARGIN
 
     for i, font in enumerate(fo_list):
-        scale_factor = PT_SIZE / font.info.unitsPerEm
+        scale_factor = scale_list[i]
+        label_font_size, label_y_pad = label_list[i]
         baseline = db.height() / 3 / scale_factor
         line_y = (
             font.info.descender if font.info.descender else -250,
@@ -55,19 +58,21 @@ def draw_metrics_page_ufo(character, fo_list, cmap_list, page_width=1000):
             draw_glyph(glyph)
             x_offset += glyph.width * scale_factor
             with db.savedState():
-                for y_value in line_y:
-                    db.stroke(0)
-                    db.strokeWidth(1)
-                    db.line((0, y_value), (glyph.width, y_value))
+                # no need to draw overlapping lines twice
+                db.fill(None)
+                db.stroke(0)
+                db.strokeWidth(1)
+                draw_horizontal_lines(sorted(set(line_y)), 0, glyph.width)
             with db.savedState():
-                for y_value in [v for v in line_y if v != 0]:
-                    db.font(FONT_MONO)
-                    db.fontSize(6 / scale_factor)
-                    # db.fill(0, 0.981, 0.574)  # Sea Foam
-                    db.fill(1, 0.186, 0.573)  # Strawberry
+                # label style is the same for all labels
+                db.font(FONT_MONO)
+                db.fontSize(label_font_size)
+                # db.fill(0, 0.981, 0.574)  # Sea Foam
+                db.fill(1, 0.186, 0.573)  # Strawberry
+                for y_value in sorted(set(line_y) - {0}):
                     db.text(
                         str(y_value),
-                        (glyph.width / 2, y_value + 2 / scale_factor),
+                        (glyph.width / 2, y_value + label_y_pad),
                         align='center')
                 db.text(
                     font.info.styleName,
@@ -78,11 +83,16 @@ def draw_metrics_page_ufo(character, fo_list, cmap_list, page_width=1000):
 def draw_metrics_page_font(character, font_info_list, page_width=1000):
 
     db.newPage(page_width, 250)
-    x_offset = MARGIN
 
+    # the character is set once per font, all in a single line of text
+    fs = db.FormattedString()
+    for f_info in font_info_list:
+        fs.append(character, font=f_info.path, fontSize=PT_SIZE)
+    db.text(fs, (MARGIN, db.height() / 3))
+
+    x_offset = MARGIN
     for f_info in font_info_list:
-        upm = f_info.upm
-        scale_factor = PT_SIZE / upm
+        scale_factor = f_info.scale_factor
         baseline = db.height() / 3 / scale_factor
 
         line_y = (
@@ -94,30 +104,26 @@ def draw_metrics_page_font(character, font_info_list, page_width=1000):
         )
         glyph_name = f_info.char_map.get(ord(character))
         with db.savedState():
-            db.font(f_info.path)
-            db.fontSize(f_info.upm)
             db.scale(scale_factor)
             db.translate(x_offset / scale_factor, baseline)
-            db.text(
-                character,
-                (0, 0)
-            )
             glyph_width = f_info.advance_widths[glyph_name]
             x_offset += glyph_width * scale_factor
             with db.savedState():
-                for y_value in line_y:
-                    db.stroke(0)
-                    db.strokeWidth(1)
-                    db.line((0, y_value), (glyph_width, y_value))
+                # no need to draw overlapping lines twice
+                db.fill(None)
+                db.stroke(0)
+                db.strokeWidth(1)
+                draw_horizontal_lines(sorted(set(line_y)), 0, glyph_width)
             with db.savedState():
-                for y_value in [v for v in line_y if v != 0]:
-                    db.font(FONT_MONO)
-                    db.fontSize(6 / scale_factor)
-                    # db.fill(0, 0.981, 0.574)  # Sea Foam
-                    db.fill(1, 0.186, 0.573)  # Strawberry
+                # label style is the same for all labels
+                db.font(FONT_MONO)
+                db.fontSize(f_info.label_font_size)
+                # db.fill(0, 0.981, 0.574)  # Sea Foam
+                db.fill(1, 0.186, 0.573)  # Strawberry
+                for y_value in sorted(set(line_y) - {0}):
                     db.text(
                         str(y_value),
-                        (glyph_width / 2, y_value + 2 / scale_factor),
+                        (glyph_width / 2, y_value + f_info.label_y_pad),
                         align='center')
                 db.text(
                     f_info.styleName,
@@ -127,7 +133,7 @@ def draw_metrics_page_font(character, font_info_list, page_width=1000):
 
 def process_font_paths(font_paths, args):
     font_list = fontSorter.sort_fonts(font_paths)
-    font_info_list = [FontInfo(font_path, args) for font_path in font_list]
+    font_info_list = get_font_infos(font_list, args)
     extension = font_list[0].suffix.upper()
     family_name = font_info_list[0].familyName
     if args.output_file_name:
@@ -136,7 +142,7 @@ def process_font_paths(font_paths, args):
         doc_name = f'comparison {family_name} ({extension[1:]})'
 
     page_width = sum(
-        [fi.cap_H_width * PT_SIZE / fi.upm for fi in font_info_list]
+        [fi.cap_H_width * fi.scale_factor for fi in font_info_list]
     ) + 2 * MARGIN
 
     for f_info in font_info_list:
@@ -147,17 +153,26 @@ def process_font_paths(font_paths, args):
             f_info.capHeight,
             f_info.ascender))
 
+    document = ChunkedDocument()
     for char in EXAMPLE_CHARS:
         draw_metrics_page_font(char, font_info_list, page_width)
+        document.add_page()
 
-    finish_drawing(doc_name)
+    finish_drawing(doc_name, document)
 
 
 def process_ufo_paths(ufo_paths, args):
     font_list = fontSorter.sort_fonts(ufo_paths)
     fo_list = [defcon.Font(f) for f in font_list]
     upm_list = [f.info.unitsPerEm for f in fo_list]
-    cmap_list = [{g.unicode: g.name for g in f if g.unicode} for f in fo_list]
+    scale_list = [PT_SIZE / upm for upm in upm_list]
+    # label font size and padding, in font units (as in FontInfo)
+    label_list = [
+        (6 / scale_factor, 2 / scale_factor) for scale_factor in scale_list]
+    # unicodeData is read from the GLIF files without loading the glyphs
+    cmap_list = [
+        {uni: gnames[0] for uni, gnames in f.unicodeData.items()}
+        for f in fo_list]
     gnames_H = [cmap.get(ord('H')) for cmap in cmap_list]
 
     family_name = fo_list[0].info.familyName
@@ -167,7 +182,7 @@ def process_ufo_paths(ufo_paths, args):
         doc_name = f'comparison {family_name} (UFO)'
     # get combined width of Hs – no matter which glyph name or UPM they have
     page_width = sum(
-        [fo[gnames_H[i]].width * PT_SIZE / upm_list[i] for i, fo in enumerate(fo_list)]
+        [fo[gnames_H[i]].width * scale_list[i] for i, fo in enumerate(fo_list)]
     ) + 2 * MARGIN
 
     for fo in fo_list:
@@ -187,16 +202,18 @@ def process_ufo_paths(ufo_paths, args):
             format_dict.get('capHeight'),
             format_dict.get('ascender')))
 
+    document = ChunkedDocument()
     for char in EXAMPLE_CHARS:
-        draw_metrics_page_ufo(char, fo_list, cmap_list, page_width)
+        draw_metrics_page_ufo(
+            char, fo_list, cmap_list, scale_list, label_list, page_width)
+        document.add_page()
 
-    finish_drawing(doc_name)
+    finish_drawing(doc_name, document)
 
 
 if __name__ == '__main__':
     args = get_options(description=__doc__)
-    font_paths = get_font_paths(args.input_dir)
-    ufo_paths = get_ufo_paths(args.input_dir)
+    ufo_paths, font_paths = get_input_paths(args.input_dir)
 
     if ufo_paths:
         process_ufo_paths(ufo_paths, args)
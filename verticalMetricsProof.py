@@ -16,6 +16,9 @@ Input: font file
 '''
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import heapq
 from pathlib import Path
 import subprocess
 import sys
@@ -24,11 +27,13 @@ import drawBot as db
 from fontTools.pens.boundsPen import BoundsPen
 from fontTools import ttLib
 
-from proofing_helpers.drawing import draw_glyph
+from proofing_helpers.drawing import (
+    clear_glyph_cache, draw_glyph, draw_horizontal_lines)
 from proofing_helpers.files import get_font_paths
 from proofing_helpers.globals import FONT_MONO
 from proofing_helpers.fontSorter import sort_fonts
-from proofing_helpers.names import get_ps_name, get_name_overlap
+from proofing_helpers.names import get_name_overlap
+from proofing_helpers.pages import ChunkedDocument
 
 IN_UI = 'drawBot.ui' in sys.modules
 
@@ -44,13 +49,16 @@ def get_glyph_names(font_info):
     '''
     Collect some standard glyphs defining basic metrics,
     as well as tallest and lowest glyphs.
+    The result is stored on the FontInfo object, so it is only computed once.
     '''
-    glyph_names = [
-        font_info.char_map.get(ord(char)) for
-        char in font_info.sample_string]
-    glyph_names += font_info.g_ymin
-    glyph_names += font_info.g_ymax
-    return glyph_names
+    if font_info.glyph_names is None:
+        glyph_names = [
+            font_info.char_map.get(ord(char)) for
+            char in font_info.sample_string]
+        glyph_names += font_info.g_ymin
+        glyph_names += font_info.g_ymax
+        font_info.glyph_names = glyph_names
+    return font_info.glyph_names
 
 
 def get_options(args=None, description=__doc__):
@@ -94,7 +102,7 @@ class FontInfo(object):
 
     def __init__(self, font_path, args):
         self.path = font_path.resolve()
-        self.ttf = ttLib.TTFont(self.path)
+        self.ttf = ttLib.TTFont(self.path, lazy=True)
         self.glyph_set = self.ttf.getGlyphSet()
         self.ascender = 0
         self.descender = 0
@@ -102,6 +110,9 @@ class FontInfo(object):
         self.capHeight = 0
         self.cap_H_width = 0
         self.sample_string = args.sample_string
+        self.glyph_bounds = {}
+        self.glyph_names = None
+        self.string_bounds = {}
         self.parse_cmap()
         self.extract_vertical_metrics()
         self.extract_extreme_n_glyphs(n=args.num_extremes)
@@ -114,12 +125,28 @@ class FontInfo(object):
         # sxHeight
         # sCapHeight
 
+        # All the data needed has been extracted. The decompiled tables are
+        # not kept around (this also makes FontInfo objects picklable).
+        del self.ttf
+        del self.glyph_set
+
+    def get_glyph_set(self):
+        '''
+        Re-open the font to get a glyph set for drawing.
+        '''
+        return ttLib.TTFont(self.path, lazy=True).getGlyphSet()
+
     def extract_upm(self):
         head_table = self.ttf['head']
         self.upm = head_table.unitsPerEm
+        # drawing constants, which only depend on the UPM
+        self.scale_factor = PT_SIZE / self.upm
+        self.label_font_size = 6 / self.scale_factor
+        self.label_y_pad = 2 / self.scale_factor
 
     def extract_names(self):
-        self.ps_name = get_ps_name(self.path)
+        # the font is already open, no need to read it again via get_ps_name
+        self.ps_name = self.ttf['name'].getDebugName(6)
         try:
             self.familyName, self.styleName = self.ps_name.split('-')
         except ValueError:
@@ -148,32 +175,33 @@ class FontInfo(object):
         for glyph_name in self.ttf.getGlyphOrder():
             pen = BoundsPen(self.glyph_set)
             self.glyph_set[glyph_name].draw(pen)
+            self.glyph_bounds[glyph_name] = pen.bounds
             if pen.bounds:
                 _, y_bot, _, y_top = pen.bounds
                 dict_top.setdefault(y_top, []).append(glyph_name)
                 dict_bot.setdefault(y_bot, []).append(glyph_name)
-        y_maxs = sorted(dict_top, reverse=True)[0:n]
-        y_mins = sorted(dict_bot)[0:n]
+        y_maxs = heapq.nlargest(n, dict_top)
+        y_mins = heapq.nsmallest(n, dict_bot)
         self.g_ymax = [dict_top[v][0] for v in y_maxs]
         self.g_ymin = [dict_bot[v][0] for v in y_mins]
 
     def extract_widths(self):
+        # only widths of encoded glyphs and extreme glyphs are ever needed
         hmtx_table = self.ttf['hmtx']
-        self.advance_widths = {g_name: w_record[0] for (
-            g_name, w_record) in hmtx_table.metrics.items()
+        g_names = set(self.char_map.values())
+        g_names.update(self.g_ymin, self.g_ymax, ['.notdef'])
+        self.advance_widths = {
+            g_name: hmtx_table[g_name][0] for g_name in g_names if
+            g_name in hmtx_table.metrics
         }
 
     def get_bounds(self, glyph_name):
-        pen = BoundsPen(self.glyph_set)
-        self.glyph_set[glyph_name].draw(pen)
-        return pen.bounds
+        # all glyphs have been measured when looking for extremes
+        return self.glyph_bounds[glyph_name]
 
     def parse_cmap(self):
         cmap_table = self.ttf['cmap']
         self.char_map = cmap_table.getBestCmap()
-        self.reverse_char_map = {
-            gname: chr(c_index) for c_index, gname in self.char_map.items()
-        }
 
     def extract_cap_H_width(self):
         # do not assume the glyph name for 'H' to be 'H'
@@ -186,7 +214,12 @@ def get_string_bounds(f_info, glyph_names):
     Calculate the width and height of the string (including swashy letters,
     which may extend to the right further than their advance width, and incl.
     glyphs which may exceed any pre-set vertical metrics).
+    The result is stored on the FontInfo object, so it is only computed once.
     '''
+    cache_key = tuple(glyph_names)
+    if cache_key in f_info.string_bounds:
+        return f_info.string_bounds[cache_key]
+
     insertion_point = 0
     x_extent = []
     # vertical metrics may exceed any outline bounds:
@@ -201,20 +234,21 @@ def get_string_bounds(f_info, glyph_names):
         y_extent.append(y_min)
         y_extent.append(y_max)
 
-    return min(x_extent), min(y_extent), max(x_extent), max(y_extent)
+    string_bounds = min(x_extent), min(y_extent), max(x_extent), max(y_extent)
+    f_info.string_bounds[cache_key] = string_bounds
+    return string_bounds
 
 
 def draw_metrics_page(f_info, normalize_upm=False):
-    upm = f_info.upm
     glyph_names = get_glyph_names(f_info)
-    scale_factor = PT_SIZE / upm
+    scale_factor = f_info.scale_factor
     x_offset = MARGIN_L / scale_factor
 
     x_min, y_min, x_max, y_max = get_string_bounds(f_info, glyph_names)
     line_height = sum([abs(y_min), y_max])
     baseline = abs(y_min) + 2 * MARGIN / scale_factor
 
-    page_width = x_max * PT_SIZE / f_info.upm + MARGIN_L + MARGIN
+    page_width = x_max * scale_factor + MARGIN_L + MARGIN
     page_height = line_height * scale_factor + 4 * MARGIN
     db.newPage(page_width, page_height)
 
@@ -241,28 +275,31 @@ def draw_metrics_page(f_info, normalize_upm=False):
         db.translate(x_offset, baseline)
         with db.savedState():
             # draw all the glyphs
+            glyph_set = f_info.get_glyph_set()
             for glyph_name in glyph_names:
-                if glyph_name not in f_info.glyph_set:
+                if glyph_name not in glyph_set:
                     continue
-                glyph = f_info.glyph_set[glyph_name]
+                glyph = glyph_set[glyph_name]
                 draw_glyph(glyph)
                 db.translate(glyph.width, 0)
 
         with db.savedState():
             # no need to draw overlapping lines twice
-            for y_value in set([value for _, value in line_labels]):
-                db.stroke(0)
-                db.strokeWidth(1)
-                db.line((-4 / scale_factor, y_value), (x_max, y_value))
+            db.fill(None)
+            db.stroke(0)
+            db.strokeWidth(1)
+            draw_horizontal_lines(
+                set([value for _, value in line_labels]),
+                -4 / scale_factor, x_max)
 
         with db.savedState():
             line_height = 10 / scale_factor
             # keep track of previous value for avoiding label overlap
             previous_label_baseline = -10000
-            used_baselines = [previous_label_baseline]
+            used_baselines = {previous_label_baseline}
             for line_index, (value_name, y_value) in enumerate(line_labels):
                 db.font(FONT_MONO)
-                db.fontSize(6 / scale_factor)
+                db.fontSize(f_info.label_font_size)
                 db.fill(1, 0.186, 0.573)  # Strawberry
                 v_offset = 10
                 label_baseline = y_value + v_offset
@@ -293,7 +330,7 @@ def draw_metrics_page(f_info, normalize_upm=False):
                     (-8 / scale_factor, label_baseline),
                     align='right')
                 previous_label_baseline = label_baseline
-                used_baselines.append(previous_label_baseline)
+                used_baselines.add(previous_label_baseline)
 
             # draw em-box
             db.stroke(0)
@@ -311,9 +348,18 @@ def draw_metrics_page(f_info, normalize_upm=False):
                 align='left')
 
 
-def process_font_path(font_path, args):
-    fi = FontInfo(font_path, args)
+def get_font_infos(font_paths, args):
+    '''
+    Make FontInfo objects for a list of font paths. Since every font is
+    parsed independently, this is done in parallel (outside the DrawBot app).
+    '''
+    if IN_UI:
+        return [FontInfo(font_path, args) for font_path in font_paths]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(partial(FontInfo, args=args), font_paths))
+
 
+def process_font_info(fi, args):
     print('{:20s} {:>3d} 0 {:>3d} {:>3d} {:>3d}'.format(
         fi.styleName,
         fi.descender,
@@ -326,12 +372,16 @@ def process_font_path(font_path, args):
         print(f'{"":20s} hi {args.num_extremes}: {" ".join(fi.g_ymax)}')
 
     draw_metrics_page(fi, args.normalize_upm)
+    clear_glyph_cache()
 
 
-def finish_drawing(doc_name):
+def finish_drawing(doc_name, document=None):
     output_path = Path(
         f'~/Desktop/vertical metrics {doc_name}.pdf').expanduser()
-    db.saveImage(output_path)
+    if document:
+        document.save(output_path)
+    else:
+        db.saveImage(output_path)
     print('saved PDF to', output_path)
     subprocess.call(['open', output_path])
     db.endDrawing()
@@ -350,9 +400,13 @@ if __name__ == '__main__':
     font_paths = get_font_paths(args.input_dir)
     if font_paths:
         sorted_font_paths = sort_fonts(font_paths)
+        # pages are only kept in memory when they are shown in the UI
+        document = None if IN_UI else ChunkedDocument()
 
-        for font_path in sorted_font_paths:
-            process_font_path(font_path, args)
+        for fi in get_font_infos(sorted_font_paths, args):
+            process_font_info(fi, args)
+            if document:
+                document.add_page()
 
         if args.output_file_name:
             doc_name = args.output_file_name
@@ -360,6 +414,6 @@ if __name__ == '__main__':
             doc_name = get_name_overlap([p.name for p in sorted_font_paths])
 
         if not IN_UI:
-            finish_drawing(doc_name)
+            finish_drawing(doc_name, document)
     else:
         print('no fonts found')
@@ -17,6 +17,7 @@ Input: folder containing font files.
 '''
 
 import argparse
+import functools
 import os
 from pathlib import Path
 import subprocess
@@ -26,6 +27,9 @@ import drawBot as db
 
 from proofing_helpers import fontSorter
 from proofing_helpers.files import get_font_paths, read_text_file
+from proofing_helpers.pages import ChunkedDocument
+
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), '_content')
 
 
 def get_options():
@@ -54,63 +58,87 @@ def get_options():
     return parser.parse_args()
 
 
-if __name__ == '__main__':
-    args = get_options()
-    if os.path.isdir(args.d):
-        font_paths = get_font_paths(args.d)
-        fonts = fontSorter.sort_fonts(font_paths)
-    else:
-        sys.exit('no fonts found')
+@functools.lru_cache(maxsize=8)
+def get_content_lines(file_name):
+    '''
+    Read a file from the _content folder (only once), return a tuple of
+    non-empty lines.
+    '''
+    content = read_text_file(os.path.join(CONTENT_DIR, file_name))
+    return tuple(filter(None, content.splitlines()))
 
-    db.newDrawing()
-    PT_SIZE = args.pointsize
-    LEADING = PT_SIZE * 1.2
-    MARGIN = 48
 
-    v_content_path = os.path.join(
-        os.path.dirname(__file__), '_content/waterfall_vertical.txt')
-    h_content_path = os.path.join(
-        os.path.dirname(__file__), '_content/waterfall_horizontal.txt')
-    v_content = read_text_file(v_content_path)
-    h_content = read_text_file(h_content_path)
+def make_proof(fonts, pt_size, output_path):
+
+    db.newDrawing()
+    # pages are written to disk in chunks, for long lists of fonts or words
+    document = ChunkedDocument()
+    leading = pt_size * 1.2
+    margin = 48
+
+    v_lines = get_content_lines('waterfall_vertical.txt')
+    h_lines = get_content_lines('waterfall_horizontal.txt')
+
+    # one template formatted string per font, which only lacks the text
+    fs_templates = [
+        db.FormattedString(
+            font=font,
+            fontSize=pt_size,
+            openTypeFeatures=dict(
+                onum=True,
+                pnum=True,
+            ),
+        ) for font in fonts]
+
+    # all vertical pages have the same size, so the line offsets are, too
+    _, page_height = db.sizes('Legal')
+    top_line = page_height - pt_size - margin
+    offsets = [
+        top_line - f_index * leading for f_index in range(len(fonts))]
 
     # Create a new page for each word in the vertical content text file:
-    for line in v_content.split('\n'):
+    for line in v_lines:
         db.newPage('Legal')
-        top_line = db.height() - PT_SIZE - MARGIN
-        offset = top_line
-        for f_index, font in enumerate(fonts):
-            offset = top_line - f_index * LEADING
-            fs = db.FormattedString(
-                line,
-                font=font,
-                fontSize=PT_SIZE,
-                openTypeFeatures=dict(
-                    onum=True,
-                    pnum=True,
-                ),
-            )
-
-            db.text(fs, (MARGIN, offset))
+        for fs_template, offset in zip(fs_templates, offsets):
+            fs = fs_template.copy()
+            fs.append(line)
+
+            db.text(fs, (margin, offset))
+        document.add_page()
 
     # Create a page with horizontal waterfall content:
     db.newPage('LegalLandscape')
-    top_line = db.height() - PT_SIZE - MARGIN
+    top_line = db.height() - pt_size - margin
+    fs_template = db.FormattedString(
+        fontSize=pt_size,
+    )
 
-    for word_index, word in enumerate(h_content.split('\n')):
-        offset = top_line - word_index * LEADING
+    for word_index, word in enumerate(h_lines):
+        offset = top_line - word_index * leading
 
-        fs = db.FormattedString(
-            fontSize=PT_SIZE,
-        )
+        fs = fs_template.copy()
+        append = fs.append
         for font in fonts:
-            fs.append(word, font=font)
+            append(word, font=font)
 
-        db.text(fs, (MARGIN, offset))
+        db.text(fs, (margin, offset))
+    document.add_page()
 
-    dir_name = Path(args.d).name
-    output_path = f'~/Desktop/waterfallProof ({dir_name}).pdf'
-    db.saveImage(output_path)
+    document.save(output_path)
     db.endDrawing()
     print(f'saved to {output_path}')
-    subprocess.call(['open', os.path.expanduser(output_path)])
+    subprocess.Popen(['open', output_path])
+
+
+if __name__ == '__main__':
+    args = get_options()
+    if os.path.isdir(args.d):
+        font_paths = get_font_paths(args.d)
+        fonts = fontSorter.sort_fonts(font_paths)
+    else:
+        sys.exit('no fonts found')
+
+    dir_name = Path(args.d).name
+    output_path = Path(
+        f'~/Desktop/waterfallProof ({dir_name}).pdf').expanduser()
+    make_proof(fonts, args.pointsize, output_path)